@@ -2,28 +2,46 @@ from __future__ import annotations
 
 import json
 import sys
-from typing import Any, cast
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, cast
 
 import typer
 from rich import print as rprint
 
-from ossmk.exporters.json import write_json
+from ossmk.exporters.json import write_json, write_json_stream
 
-try:
-    from ossmk.exporters.parquet import write_parquet
-except Exception:  # pragma: no cover - optional
-    write_parquet = None  # type: ignore
-from ossmk.core.models import ContributionEvent
-from ossmk.core.rules.llm import LLMConfig, suggest_rules_from_events
-from ossmk.core.services.analyze import analyze_github_user
-from ossmk.core.services.score import load_rules, score_events
-from ossmk.providers.github import provider as github_provider
-from ossmk.storage.base import open_backend
-from ossmk.utils import parse_since
+try:  # optional fast JSON parsing
+    import orjson as _orjson  # type: ignore[reportMissingImports]
+    orjson: Any | None = cast(Any, _orjson)
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ossmk.core.models import ContributionEvent
 
 app = typer.Typer(help="OSS Metrics Kit CLI")
 
 
+def _valid_login(s: str) -> bool:
+    # GitHub login: 1-39 ASCII alphanumerics or '-', not starting/ending with '-'.
+    return (
+        0 < len(s) <= 39
+        and s.isascii()
+        and s[0] != "-"
+        and s[-1] != "-"
+        and all(c == "-" or c.isalnum() for c in s)
+    )
+
+
+# Option defaults shared by several commands; built once at import.
+RULES_OPTION = typer.Option("default", help="Rule set id or TOML file path")
+UNSAFE_FAST_OPTION = typer.Option(
+    False, "--unsafe-fast", help="Skip per-event validation for trusted input (from fetch)"
+)
+
+
 @app.command()
 def version() -> None:
     """Show version."""
@@ -32,100 +50,176 @@ def version() -> None:
     rprint({"ossmk": __version__})
 
 
+FETCH_PROVIDER = typer.Option("github", help="Provider id (e.g., github)")
+FETCH_REPO = typer.Option(..., help="Target repo full name (owner/name)")
+FETCH_OUT = typer.Option("-", help="Output destination. Use parquet:/path to write Parquet.")
+FETCH_SINCE = typer.Option(None, help="Time window filter, e.g., '30d' or ISO-8601")
+FETCH_API = typer.Option("rest", help="API mode: rest|graphql|auto")
+
+
 @app.command()
 def fetch(
-    provider: str = typer.Option("github", help="Provider id (e.g., github)"),
-    repo: str = typer.Option(..., help="Target repo full name (owner/name)"),
-    out: str = typer.Option("-", help="Output destination. Use parquet:/path to write Parquet."),
-    since: str | None = typer.Option(None, help="Time window filter, e.g., '30d' or ISO-8601"),
-    api: str = typer.Option("rest", help="API mode: rest|graphql|auto"),
+    provider: str = FETCH_PROVIDER,
+    repo: str = FETCH_REPO,
+    out: str = FETCH_OUT,
+    since: str | None = FETCH_SINCE,
+    api: str = FETCH_API,
 ) -> None:
     """Fetch contribution data and output normalized events as JSON."""
     if provider != "github":
         raise typer.BadParameter("Only 'github' provider is currently supported")
+    from ossmk.providers.github import provider as github_provider
+    from ossmk.utils import run_async
+
     events: list[ContributionEvent] = []
     if api in ("rest", "auto"):
-        events.extend(github_provider.fetch_repo_issues_and_prs(repo))
-        events.extend(github_provider.fetch_repo_commits(repo, since=since))
-        events.extend(github_provider.fetch_repo_pr_reviews(repo))
+        # issues/PRs, commits and reviews are independent crawls; overlap them
+        events.extend(run_async(github_provider.fetch_repo_all_async(repo, since=since)))
     # graphql path for repo-scope is non-trivial; kept for user-scope below.
-    payload: list[dict[str, Any]] = [e.model_dump() for e in events]
     if out.startswith("parquet:"):
-        if not write_parquet:
-            raise typer.BadParameter(
-                "Parquet support requires 'pyarrow'. Install extras: "
-                "pip install 'oss-metrics-kit[exporters-parquet]'"
-            )
-        write_parquet(payload, out.split(":", 1)[1])
+        _require_parquet().write_events_parquet(events, out.split(":", 1)[1])
     else:
-        write_json(payload, out=out)
+        write_json_stream(_iter_event_rows(events), out=out)
+
+
+def _require_parquet() -> ModuleType:
+    """The Parquet exporter module, or a usage error when pyarrow is not installed."""
+    from ossmk.exporters import parquet
+
+    if parquet.pa is None:
+        raise typer.BadParameter(
+            "Parquet support requires 'pyarrow'. Install extras: "
+            "pip install 'oss-metrics-kit[exporters-parquet]'"
+        )
+    return parquet
+
+
+def _iter_event_rows(events: Iterable[ContributionEvent]) -> Iterator[dict[str, Any]]:
+    from ossmk.core.models import CONTRIBUTION_EVENT_FIELDS
+
+    # Plain attribute reads; avoids model_dump's per-instance serializer walk.
+    fields = CONTRIBUTION_EVENT_FIELDS
+    return ({k: getattr(e, k) for k in fields} for e in events)
 
 
 def _read_json_input(path: str) -> Any:
+    if orjson is not None:
+        if path == "-":
+            return orjson.loads(sys.stdin.buffer.read())
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     if path == "-":
         return json.load(sys.stdin)
     with open(path, encoding="utf-8") as f:
         return json.load(f)
 
 
+def _trusted_event(e: dict[str, Any]) -> ContributionEvent:
+    from ossmk.core.models import ContributionEvent, EventKind
+
+    # Skip full validation; only coerce the fields scoring relies on.
+    created_at = e["created_at"]
+    return ContributionEvent.model_construct(
+        id=str(e["id"]),
+        kind=EventKind(e["kind"]),
+        repo_id=e["repo_id"],
+        user_id=e["user_id"],
+        created_at=(
+            created_at if isinstance(created_at, datetime) else datetime.fromisoformat(created_at)
+        ),
+        lines_added=e.get("lines_added", 0),
+        lines_removed=e.get("lines_removed", 0),
+    )
+
+
+def _events_from_payload(raw: Any, unsafe_fast: bool = False) -> list[ContributionEvent]:
+    from ossmk.core.models import ContributionEvent
+
+    items = cast(list[dict[str, Any]], raw)
+    if unsafe_fast:
+        # Trusted input (e.g. our own `fetch` output) does not need re-validation.
+        return [_trusted_event(e) for e in items]
+    return [ContributionEvent.model_validate(e) for e in items]
+
+
+SCORE_INPUT = typer.Option("-", help="Input path (JSON events) or - for stdin")
+SCORE_OUT = typer.Option("-", help="Output destination (path or - for stdout)")
+
+
 @app.command()
 def score(
-    input: str = typer.Option("-", help="Input path (JSON events) or - for stdin"),
-    rules: str = typer.Option("default", help="Rule set id or TOML file path"),
-    out: str = typer.Option("-", help="Output destination (path or - for stdout)"),
+    input: str = SCORE_INPUT,
+    rules: str = RULES_OPTION,
+    out: str = SCORE_OUT,
+    unsafe_fast: bool = UNSAFE_FAST_OPTION,
 ) -> None:
     """Score contributions and output per-user, per-dimension scores."""
+    from ossmk.core.services.score import load_rules, score_events
+
     raw = _read_json_input(input)
-    events = [ContributionEvent.model_validate(e) for e in raw]
+    events = _events_from_payload(raw, unsafe_fast=unsafe_fast)
     rule_set = load_rules(rules)
     result = score_events(events, rule_set)
     write_json(result, out=out)
 
 
+ANALYZE_LOGIN = typer.Argument(..., help="GitHub login")
+ANALYZE_OUT = typer.Option("-", help="Output destination. Use parquet:/path for scores Parquet.")
+ANALYZE_SAVE_PG = typer.Option(False, help="Save events and scores to Postgres")
+ANALYZE_PG_DSN = typer.Option(None, help="Postgres DSN (overrides env)")
+ANALYZE_SINCE = typer.Option("90d", help="Time window filter for commits, e.g., '90d'")
+ANALYZE_API = typer.Option("auto", help="API mode: rest|graphql|auto")
+
+
 @app.command("analyze-user")
 def analyze_user(
-    login: str = typer.Argument(..., help="GitHub login"),
-    rules: str = typer.Option("default", help="Rule set id or TOML file path"),
-    out: str = typer.Option("-", help="Output destination. Use parquet:/path for scores Parquet."),
-    save_pg: bool = typer.Option(False, help="Save events and scores to Postgres"),
-    pg_dsn: str | None = typer.Option(None, help="Postgres DSN (overrides env)"),
-    since: str | None = typer.Option("90d", help="Time window filter for commits, e.g., '90d'"),
-    api: str = typer.Option("auto", help="API mode: rest|graphql|auto"),
+    login: str = ANALYZE_LOGIN,
+    rules: str = RULES_OPTION,
+    out: str = ANALYZE_OUT,
+    save_pg: bool = ANALYZE_SAVE_PG,
+    pg_dsn: str | None = ANALYZE_PG_DSN,
+    since: str | None = ANALYZE_SINCE,
+    api: str = ANALYZE_API,
 ) -> None:
     """Analyze a GitHub user: fetch -> score -> output, optionally persist to Postgres."""
+    from ossmk.core.services.analyze import analyze_github_user
+    from ossmk.utils import parse_since
+
     # Validate login
-    import re
-    if not re.fullmatch(r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,37}[A-Za-z0-9])?", login or ""):
+    if not _valid_login(login or ""):
         raise typer.BadParameter("Invalid GitHub login. Use profile name like 'octocat'.")
     # Clamp since (max 180d)
     _ = parse_since(since, max_days=180)
     result = analyze_github_user(login, rules=rules, since=since, api=api)
     # output
-    obj: dict[str, Any] = {
-        "user": result.user,
-        "events_count": result.events_count,
-        "scores": result.scores,
-        "summary": result.summary,
-    }
     if out.startswith("parquet:"):
-        if not write_parquet:
-            raise typer.BadParameter(
-                "Parquet support requires 'pyarrow'. Install extras: "
-                "pip install 'oss-metrics-kit[exporters-parquet]'"
-            )
+        parquet = _require_parquet()
         # For Parquet, we write scores table and still print summary to stdout for quick feedback.
-        write_parquet(cast(list[dict[str, Any]], result.scores), out.split(":", 1)[1])
-        rprint({"summary": result.summary, "scores_parquet": out.split(":", 1)[1]})
+        path = out.split(":", 1)[1]
+        parquet.write_scores_parquet(result.scores, path)
+        write_json({"summary": result.summary, "scores_parquet": path}, out="-")
     else:
+        obj: dict[str, Any] = {
+            "user": result.user,
+            "events_count": result.events_count,
+            "scores": result.scores,
+            "summary": result.summary,
+        }
         write_json(obj, out=out)
 
 
+SAVE_DSN = typer.Argument(..., help="Storage DSN (e.g., postgresql://... or sqlite:///path.db)")
+SAVE_INPUT = typer.Option("-", help="Input path for scores JSON (from analyze-user)")
+
+
 @app.command("save")
 def save(
-    dsn: str = typer.Argument(..., help="Storage DSN (e.g., postgresql://... or sqlite:///path.db)"),
-    input: str = typer.Option("-", help="Input path for scores JSON (from analyze-user)"),
+    dsn: str = SAVE_DSN,
+    input: str = SAVE_INPUT,
 ) -> None:
     """Persist scores (and optionally events later) to the selected storage backend."""
+    from ossmk.storage.base import open_backend
+
     payload = _read_json_input(input)
     scores: list[dict[str, Any]]
     if isinstance(payload, list):
@@ -141,15 +235,24 @@ def save(
         backend.close()
 
 
+RULES_LLM_INPUT = typer.Option("-", help="Input events JSON (from fetch or analyze-user --out -)")
+RULES_LLM_PROVIDER = typer.Option("openai", help="LLM provider: openai|anthropic")
+RULES_LLM_MODEL = typer.Option("gpt-4o-mini", help="Model id for the provider")
+RULES_LLM_API_KEY = typer.Option(None, help="API key (or use env)")
+RULES_LLM_OUT = typer.Option("rules.toml", help="Output TOML path")
+
+
 @app.command("rules-llm")
 def rules_llm(
-    input: str = typer.Option("-", help="Input events JSON (from fetch or analyze-user --out -)"),
-    provider: str = typer.Option("openai", help="LLM provider: openai|anthropic"),
-    model: str = typer.Option("gpt-4o-mini", help="Model id for the provider"),
-    api_key: str | None = typer.Option(None, help="API key (or use env)"),
-    out: str = typer.Option("rules.toml", help="Output TOML path"),
+    input: str = RULES_LLM_INPUT,
+    provider: str = RULES_LLM_PROVIDER,
+    model: str = RULES_LLM_MODEL,
+    api_key: str | None = RULES_LLM_API_KEY,
+    out: str = RULES_LLM_OUT,
 ) -> None:
     """Suggest a rule TOML using an LLM from input events statistics."""
+    from ossmk.core.rules.llm import LLMConfig, suggest_rules_from_events
+
     payload = _read_json_input(input)
     events_list: list[dict[str, Any]]
     if isinstance(payload, list):
@@ -166,7 +269,6 @@ def rules_llm(
 
 
 RULES_TEST_EVENTS = typer.Option(..., help="Input events JSON path")
-RULES_TEST_RULES = typer.Option("default", help="Rule set id or TOML file path")
 RULES_TEST_TOTAL_MIN = typer.Option(None, help="Assert sum(scores) >= value")
 RULES_TEST_EXPECT_DIM = typer.Option(
     None,
@@ -178,20 +280,20 @@ RULES_TEST_EXPECT_DIM = typer.Option(
 @app.command("rules-test")
 def rules_test(
     events: str = RULES_TEST_EVENTS,
-    rules: str = RULES_TEST_RULES,
+    rules: str = RULES_OPTION,
     expect_total_min: float | None = RULES_TEST_TOTAL_MIN,
     expect_dim: list[str] = RULES_TEST_EXPECT_DIM,
+    unsafe_fast: bool = UNSAFE_FAST_OPTION,
 ) -> None:
     """Test rules against sample events with simple assertions."""
+    from ossmk.core.services.score import load_rules, score_events_with_totals
+
     data = _read_json_input(events)
-    evs = [ContributionEvent.model_validate(e) for e in data]
+    evs = _events_from_payload(data, unsafe_fast=unsafe_fast)
     rs = load_rules(rules)
-    scores = score_events(evs, rs)
-    # aggregate
-    total = sum(float(s["value"]) for s in scores)
-    by_dim: dict[str, float] = {}
-    for s in scores:
-        by_dim[s["dimension"]] = by_dim.get(s["dimension"], 0.0) + float(s["value"])
+    # aggregate while scoring
+    _, by_dim = score_events_with_totals(evs, rs)
+    total = sum(by_dim.values())
     # assertions
     ok = True
     msgs: list[str] = []
@@ -44,6 +44,10 @@ class ContributionEvent(BaseModel):
     lines_removed: int = 0
 
 
+# Field order used when flattening events into plain rows (JSON/Parquet export).
+CONTRIBUTION_EVENT_FIELDS: tuple[str, ...] = tuple(ContributionEvent.model_fields)
+
+
 class Score(BaseModel):
     subject_id: str
     dimension: str
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import sys
+import time
+from collections import Counter
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, cast
 
+from ossmk.core.models import EventKind
+
 
 @dataclass
 class LLMConfig:
@@ -13,6 +21,9 @@ class LLMConfig:
     endpoint: str | None = None  # for Azure
 
 
+# Interned keys for the known kinds so counting hits the identity fast path.
+_KIND_KEYS: dict[str, str] = {k.value: sys.intern(k.value) for k in EventKind}
+
 SYSTEM_PROMPT = (
     "You are a helpful assistant that designs fair scoring rules for OSS contributions. "
     "Return a minimal TOML with [dimensions.<name>] having 'kinds', 'weight', and "
@@ -62,23 +73,85 @@ def _anthropic_complete(cfg: LLMConfig, content: str) -> str:
     return "".join(parts)
 
 
+# With OSSMK_LLM_CACHE=1, completions keyed by a hash of provider/model/prompt are reused
+# for a week from memory and $XDG_CACHE_HOME/ossmk/llm.
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_LLM_CACHE: dict[str, tuple[float, str]] = {}
+
+
+def _llm_cache_dir() -> Path:
+    base = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "ossmk" / "llm"
+
+
+def _llm_cache_key(cfg: LLMConfig, content: str) -> str:
+    payload = {
+        "p": cfg.provider.lower(),
+        "m": cfg.model,
+        "e": cfg.endpoint,
+        "s": SYSTEM_PROMPT,
+        "c": content,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _llm_cache_get(key: str) -> str | None:
+    now = time.time()
+    hit = _LLM_CACHE.get(key)
+    if hit and now - hit[0] < LLM_CACHE_TTL_SECONDS:
+        return hit[1]
+    path = _llm_cache_dir() / f"{key}.toml"
+    try:
+        mtime = path.stat().st_mtime
+        if now - mtime < LLM_CACHE_TTL_SECONDS:
+            text = path.read_text(encoding="utf-8")
+            _LLM_CACHE[key] = (mtime, text)
+            return text
+    except OSError:
+        pass
+    return None
+
+
+def _llm_cache_set(key: str, text: str) -> None:
+    _LLM_CACHE[key] = (time.time(), text)
+    try:
+        path = _llm_cache_dir() / f"{key}.toml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    except OSError:
+        pass  # disk layer is best-effort
+
+
 def suggest_rules_from_events(events: list[dict[str, Any]], cfg: LLMConfig) -> str:
     """Return TOML text suggested by the chosen LLM provider.
 
     The caller is responsible for parsing and validating the TOML into a RuleSet if desired.
+    With OSSMK_LLM_CACHE=1, responses are reused for a week per (provider, model, prompt)
+    instead of calling the provider again.
     """
     # Compress to counts per kind to avoid leaking full data and reduce tokens
-    counts: dict[str, int] = {}
-    for e in events:
-        k = str(e.get("kind"))
-        counts[k] = counts.get(k, 0) + 1
+    kind_keys = _KIND_KEYS
+    counts = Counter(
+        kind_keys.get(k, k) if isinstance(k, str) else str(k)
+        for k in (e.get("kind") for e in events)
+    )
     prefix = (
         "Please propose fair scoring rules for the following event counts as TOML.\n"
     )
     content = prefix + json.dumps({"counts": counts}, ensure_ascii=False)
+    use_cache = os.getenv("OSSMK_LLM_CACHE", "").lower() in {"1", "true", "yes", "on"}
+    key = _llm_cache_key(cfg, content)
+    if use_cache:
+        cached = _llm_cache_get(key)
+        if cached is not None:
+            return cached
     prov = cfg.provider.lower()
     if prov == "openai":
-        return _openai_complete(cfg, content)
-    if prov == "anthropic":
-        return _anthropic_complete(cfg, content)
-    raise ValueError(f"Unsupported LLM provider: {cfg.provider}")
+        text = _openai_complete(cfg, content)
+    elif prov == "anthropic":
+        text = _anthropic_complete(cfg, content)
+    else:
+        raise ValueError(f"Unsupported LLM provider: {cfg.provider}")
+    if use_cache and text:
+        _llm_cache_set(key, text)
+    return text
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
-from .analyze import analyze_github_user
-from .score import RuleSet, load_rules, score_events
+from typing import TYPE_CHECKING, Any
+
+from .score import (
+    RuleSet,
+    load_rules,
+    score_events,
+    score_events_with_totals,
+)
+
+if TYPE_CHECKING:
+    from .analyze import analyze_github_user, analyze_github_users
+
+
+def __getattr__(name: str) -> Any:
+    # analyze pulls in the GitHub client and Postgres helpers; load it on first use only.
+    if name in ("analyze_github_user", "analyze_github_users"):
+        from . import analyze
+
+        return getattr(analyze, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "RuleSet",
     "load_rules",
     "score_events",
+    "score_events_with_totals",
     "analyze_github_user",
+    "analyze_github_users",
 ]
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import os
+import time
+from collections.abc import Iterable
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
 
 from ossmk.core.models import ContributionEvent
-from ossmk.core.services.score import ScoreEntry, load_rules, score_events
+from ossmk.core.services.score import (
+    RuleSet,
+    ScoreEntry,
+    load_rules,
+    score_events_with_totals,
+)
 from ossmk.providers.github import provider as github
 from ossmk.storage.postgres import (
     can_perform_update,
@@ -25,7 +36,7 @@ from ossmk.storage.postgres import (
 from ossmk.storage.postgres import (
     save_snapshot as pg_save_snapshot,
 )
-from ossmk.utils import parse_since
+from ossmk.utils import parse_since, run_async
 
 
 @dataclass
@@ -37,32 +48,153 @@ class AnalysisResult:
     summary: dict[str, Any]
 
 
-def analyze_github_user(
-    login: str,
-    rules: str = "default",
-    since: str | None = None,
-    api: str = "auto",
-) -> AnalysisResult:
+def _clamp_since(since: str | None) -> str | None:
     # Clamp since for programmatic usage as well
     try:
         max_days = int(os.getenv("OSSMK_MAX_SINCE_DAYS", "180"))
     except Exception:
         max_days = 180
-    since = parse_since(since, max_days=max_days)
+    return parse_since(since, max_days=max_days)
 
+
+async def _fetch_events_async(
+    login: str, since: str | None, api: str, max_repos: int | None
+) -> list[ContributionEvent]:
     if api == "rest":
-        events: list[ContributionEvent] = github.fetch_user_contributions(login, since=since)
-    elif api == "graphql":
-        events = asyncio.run(github.fetch_user_contributions_graphql_full_async(login, since=since))
-    else:
-        # auto: parallel REST for breadth and speed
-        events = asyncio.run(github.fetch_user_contributions_async(login, since=since))
+        return await asyncio.to_thread(
+            github.fetch_user_contributions, login, max_repos=max_repos, since=since
+        )
+    if api == "graphql":
+        return await github.fetch_user_contributions_collection_async(login, since=since)
+    # auto: parallel REST for breadth and speed
+    return await github.fetch_user_contributions_async(login, max_repos=max_repos, since=since)
+
+
+def _events_cache_ttl() -> float:
+    try:
+        return float(os.getenv("OSSMK_EVENTS_CACHE_TTL", "0"))
+    except ValueError:
+        return 0.0
+
+
+def _since_day(since: str | None) -> str | None:
+    """UTC date of a resolved `since`, so '90d' keeps one cache entry for the whole day."""
+    if since is None:
+        return None
+    try:
+        return datetime.fromisoformat(since).astimezone(UTC).date().isoformat()
+    except ValueError:
+        return since
+
+
+def _events_cache_file(
+    login: str, since: str | None, api: str, max_repos: int | None
+) -> Path | None:
+    """Cache file for a login's fetched events, or None when OSSMK_EVENTS_CACHE_TTL is unset.
+
+    `since` is the resolved cutoff; the env switches that change what a crawl returns
+    are part of the key.
+    """
+    if _events_cache_ttl() <= 0:
+        return None
+    key = json.dumps(
+        [
+            login.lower(),
+            _since_day(since),
+            api,
+            max_repos,
+            os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1",
+            os.getenv("OSSMK_USE_GRAPHQL") == "1",
+        ]
+    )
+    base = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "ossmk" / "events" / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+def _read_cached_events(path: Path | None) -> list[ContributionEvent] | None:
+    """Events cached at `path`, or None when missing or older than the TTL (then removed)."""
+    if path is None:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime >= _events_cache_ttl():
+            path.unlink()
+            return None
+        raw = json.loads(path.read_bytes())
+        return [ContributionEvent.model_validate(e) for e in raw]
+    except Exception:
+        return None
+
+
+def _write_cached_events(path: Path | None, events: list[ContributionEvent]) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps([e.model_dump(mode="json") for e in events]))
+    except OSError:
+        pass  # best-effort
+
+
+def analyze_github_user(
+    login: str,
+    rules: str = "default",
+    since: str | None = None,
+    api: str = "auto",
+    max_repos: int | None = 20,
+) -> AnalysisResult:
+    since = _clamp_since(since)
+    cache_file = _events_cache_file(login, since, api, max_repos)
+    events = _read_cached_events(cache_file)
+    if events is None:
+        if api == "rest":
+            events = github.fetch_user_contributions(login, max_repos=max_repos, since=since)
+        else:
+            events = run_async(_fetch_events_async(login, since, api, max_repos))
+        _write_cached_events(cache_file, events)
     rs = load_rules(rules)
-    scores = score_events(events, rs)
+    return _build_result(login, events, *score_events_with_totals(events, rs))
+
+
+async def _analyze_one(
+    login: str, rs: RuleSet, since: str | None, api: str, max_repos: int | None
+) -> AnalysisResult:
+    cache_file = _events_cache_file(login, since, api, max_repos)
+    events = _read_cached_events(cache_file)
+    if events is None:
+        events = await _fetch_events_async(login, since, api, max_repos)
+        _write_cached_events(cache_file, events)
+    # scoring is CPU-bound; run it off the loop so other users' fetches keep progressing
+    loop = asyncio.get_running_loop()
+    scores, by_dim = await loop.run_in_executor(None, score_events_with_totals, events, rs)
+    return _build_result(login, events, scores, by_dim)
+
+
+def analyze_github_users(
+    logins: Iterable[str],
+    rules: str = "default",
+    since: str | None = None,
+    api: str = "auto",
+    max_repos: int | None = 20,
+) -> list[AnalysisResult]:
+    """Analyze several users with overlapping fetches; results follow `logins` order."""
+    since = _clamp_since(since)
+    rs = load_rules(rules)
+
+    async def _run() -> list[AnalysisResult]:
+        return list(
+            await asyncio.gather(*(_analyze_one(lg, rs, since, api, max_repos) for lg in logins))
+        )
+
+    return run_async(_run())
+
+
+def _build_result(
+    login: str,
+    events: list[ContributionEvent],
+    scores: list[ScoreEntry],
+    by_dim: dict[str, float],
+) -> AnalysisResult:
     # simple summary for FE
-    by_dim: dict[str, float] = {}
-    for s in scores:
-        by_dim[s["dimension"]] = by_dim.get(s["dimension"], 0.0) + float(s["value"])
     summary = {
         "login": login,
         "total_events": len(events),
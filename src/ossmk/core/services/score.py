@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import copy
 import os
+import sys
 import tomllib
 from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from math import exp, log
+from pathlib import Path
 from typing import Any, TypedDict, cast
 
 from ossmk.core.models import ContributionEvent
@@ -22,6 +26,19 @@ class RuleSet:
     decay_mode: str | None = None  # 'exponential' (default), 'linear', 'window'
     decay_window_days: float | None = None  # for 'window' mode
 
+    @property
+    def by_kind(self) -> dict[str, tuple[tuple[str, float], ...]]:
+        """Inverted index kind -> ((dimension, base weight), ...), built from `dimensions`.
+
+        Derived on each access (once per scoring call) so it follows edits to `dimensions`.
+        """
+        index: dict[str, list[tuple[str, float]]] = defaultdict(list)
+        for dim, spec in self.dimensions.items():
+            weights_by_kind = spec.get("weights_by_kind", {})
+            for k in spec.get("kinds", set()):
+                index[k].append((dim, weights_by_kind.get(k, spec.get("weight", 1.0))))
+        return {k: tuple(v) for k, v in index.items()}
+
 
 def _default_rules() -> RuleSet:
     return RuleSet(
@@ -40,50 +57,115 @@ def _default_rules() -> RuleSet:
 
 
 def load_rules(rules: str) -> RuleSet:
-    # if 'default' use built-in; else if file path endswith .toml, parse; else use built-in
+    """Resolve `rules` to a RuleSet, parsing a rules file again only when it changes.
+
+    Parsed files are memoized by resolved path and mtime; every caller gets its own copy.
+    """
+    path = _rules_file(rules)
+    if path is None:
+        return _default_rules()
+    try:
+        mtime: float | None = path.stat().st_mtime
+    except OSError:
+        mtime = None
+    return copy.deepcopy(_load_rules_file(path, mtime))
+
+
+@lru_cache(maxsize=32)
+def _load_rules_file(path: Path, mtime: float | None) -> RuleSet:
+    return _parse_rules_toml(str(path))
+
+
+def _rules_file(rules: str) -> Path | None:
+    # 'default'/'auto' use OSSMK_RULES_FILE when it exists; other .toml paths are parsed
     if rules in ("default", "auto"):
         env_path = os.getenv("OSSMK_RULES_FILE")
-        if env_path and os.path.exists(env_path):
-            rules = env_path
-        else:
-            return _default_rules()
-    if rules.endswith(".toml"):
-        with open(rules, "rb") as f:
-            data = tomllib.load(f)
-        dims: dict[str, dict[str, Any]] = {}
-        dimensions_raw = cast(dict[str, Any], data.get("dimensions", {}))
-        for dim, spec_any in dimensions_raw.items():
-            spec = cast(dict[str, Any], spec_any)
-            kinds = {str(x) for x in cast(list[Any], spec.get("kinds", []))}
-            weight = float(spec.get("weight", 1.0))
-            weights_raw = cast(dict[Any, Any], (spec.get("weights_by_kind", {}) or {}))
-            weights_by_kind: dict[str, float] = {str(k): float(v) for k, v in weights_raw.items()}
-            clip = spec.get("clip_per_user_day")  # allow per-dimension override if needed
-            entry: dict[str, Any] = {"kinds": kinds, "weight": weight}
-            if weights_by_kind:
-                entry["weights_by_kind"] = weights_by_kind
-            if clip:
-                clip_map = cast(dict[Any, Any], clip)
-                entry["clip_per_user_day"] = {str(k): int(v) for k, v in clip_map.items()}
-            dims[dim] = entry
-        fairness_raw = cast(dict[str, Any], data.get("fairness", {}))
-        fairness_clip = cast(dict[Any, Any] | None, fairness_raw.get("clip_per_user_day"))
-        fairness_map = (
-            {str(k): int(v) for k, v in fairness_clip.items()}
-            if fairness_clip
-            else _default_rules().fairness
-        )
-        # decay
-        hl = data.get("decay_half_life_days")
-        decay_global = float(hl) if hl is not None else None
-        return RuleSet(
-            dimensions=dims or _default_rules().dimensions,
-            fairness=fairness_map,
-            decay_half_life_days=decay_global,
-            decay_mode=data.get("decay_mode"),
-            decay_window_days=data.get("decay_window_days"),
-        )
-    return _default_rules()
+        if not (env_path and os.path.exists(env_path)):
+            return None
+        rules = env_path
+    return Path(rules).resolve() if rules.endswith(".toml") else None
+
+
+def _parse_rules_toml(path: str) -> RuleSet:
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    dims: dict[str, dict[str, Any]] = {}
+    dimensions_raw = cast(dict[str, Any], data.get("dimensions", {}))
+    for dim, spec_any in dimensions_raw.items():
+        spec = cast(dict[str, Any], spec_any)
+        kinds = {sys.intern(str(x)) for x in cast(list[Any], spec.get("kinds", []))}
+        weight = float(spec.get("weight", 1.0))
+        weights_raw = cast(dict[Any, Any], (spec.get("weights_by_kind", {}) or {}))
+        weights_by_kind: dict[str, float] = {str(k): float(v) for k, v in weights_raw.items()}
+        clip = spec.get("clip_per_user_day")  # allow per-dimension override if needed
+        entry: dict[str, Any] = {"kinds": kinds, "weight": weight}
+        if weights_by_kind:
+            entry["weights_by_kind"] = weights_by_kind
+        if clip:
+            clip_map = cast(dict[Any, Any], clip)
+            entry["clip_per_user_day"] = {str(k): int(v) for k, v in clip_map.items()}
+        # dimension names become dict keys in every score entry; share one object
+        dims[sys.intern(dim)] = entry
+    fairness_raw = cast(dict[str, Any], data.get("fairness", {}))
+    fairness_clip = cast(dict[Any, Any] | None, fairness_raw.get("clip_per_user_day"))
+    fairness_map = (
+        {str(k): int(v) for k, v in fairness_clip.items()}
+        if fairness_clip
+        else _default_rules().fairness
+    )
+    # decay
+    hl = data.get("decay_half_life_days")
+    decay_global = float(hl) if hl is not None else None
+    return RuleSet(
+        dimensions=dims or _default_rules().dimensions,
+        fairness=fairness_map,
+        decay_half_life_days=decay_global,
+        decay_mode=data.get("decay_mode"),
+        decay_window_days=data.get("decay_window_days"),
+    )
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class _EnvKnobs:
+    self_repo_penalty: float
+    user_orgs: frozenset[str]
+    org_repo_penalty: float
+    decay_half_life_days: float
+    decay_mode: str | None
+    decay_window_days: float
+
+
+def _env_knobs() -> _EnvKnobs:
+    """The OSSMK_* scoring env vars, read once per scoring call rather than per event."""
+    orgs_env = os.getenv("OSSMK_USER_ORGS", "")
+    return _EnvKnobs(
+        self_repo_penalty=_env_float("OSSMK_SELF_REPO_PENALTY", 1.0),
+        user_orgs=frozenset(o.strip().lower() for o in orgs_env.split(",") if o.strip()),
+        org_repo_penalty=_env_float("OSSMK_ORG_REPO_PENALTY", 1.0),
+        decay_half_life_days=_env_float("OSSMK_DECAY_HALF_LIFE_DAYS", 0.0),
+        decay_mode=os.getenv("OSSMK_DECAY_MODE"),
+        decay_window_days=_env_float("OSSMK_DECAY_WINDOW_DAYS", 0.0),
+    )
+
+
+def _day_key(day: Any) -> str:
+    # created_at is datetime (Pydantic parses); unvalidated events may carry ISO strings,
+    # parsed so an offset-bearing string lands on the same day as the equivalent datetime
+    if isinstance(day, str):
+        try:
+            day = datetime.fromisoformat(day)
+        except ValueError:
+            return ""
+    if isinstance(day, datetime):
+        return day.date().isoformat()
+    return ""
 
 
 class ScoreEntry(TypedDict):
@@ -94,86 +176,102 @@ class ScoreEntry(TypedDict):
 
 
 def score_events(events: Iterable[ContributionEvent], rules: RuleSet) -> list[ScoreEntry]:
-    # scores[user][dimension] = value
-    scores: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    return [
+        ScoreEntry(user_id=user, dimension=dim, value=float(val), window="all")
+        for (user, dim), val in _accumulate_scores(events, rules)
+    ]
+
+
+def score_events_with_totals(
+    events: Iterable[ContributionEvent], rules: RuleSet
+) -> tuple[list[ScoreEntry], dict[str, float]]:
+    """`score_events` plus per-dimension totals, summed while the entries are built."""
+    out: list[ScoreEntry] = []
+    by_dim: defaultdict[str, float] = defaultdict(float)
+    for (user, dim), val in _accumulate_scores(events, rules):
+        value = float(val)
+        out.append(ScoreEntry(user_id=user, dimension=dim, value=value, window="all"))
+        by_dim[dim] += value
+    return out, dict(by_dim)
+
+
+def _accumulate_scores(
+    events: Iterable[ContributionEvent], rules: RuleSet
+) -> list[tuple[tuple[str, str], float]]:
+    # scores[(user, dimension)] = value
+    scores: defaultdict[tuple[str, str], float] = defaultdict(float)
     # fairness counters per user-kind-day
     counters: dict[tuple[str, str, str], int] = defaultdict(int)
     fair_default = rules.fairness or {}
-    try:
-        self_repo_penalty = float(os.getenv("OSSMK_SELF_REPO_PENALTY", "1.0"))
-    except Exception:
-        self_repo_penalty = 1.0
+    env = _env_knobs()
+    self_repo_penalty = env.self_repo_penalty
     # org penalties
-    orgs_env = os.getenv("OSSMK_USER_ORGS", "")
-    user_orgs = {o.strip().lower() for o in orgs_env.split(",") if o.strip()}
-    try:
-        decay_hl = float(os.getenv("OSSMK_DECAY_HALF_LIFE_DAYS", "0")) or (
-            rules.decay_half_life_days or 0.0
-        )
-    except Exception:
-        decay_hl = rules.decay_half_life_days or 0.0
+    user_orgs = env.user_orgs
+    org_penalty = env.org_repo_penalty
+    decay_hl = env.decay_half_life_days or (rules.decay_half_life_days or 0.0)
     lam = log(2) / decay_hl if decay_hl and decay_hl > 0 else 0.0
-    decay_mode = (rules.decay_mode or os.getenv("OSSMK_DECAY_MODE") or "exponential").lower()
-    try:
-        window_days = float(os.getenv("OSSMK_DECAY_WINDOW_DAYS", "0")) or (
-            rules.decay_window_days or 0.0
-        )
-    except Exception:
-        window_days = rules.decay_window_days or 0.0
+    decay_mode = (rules.decay_mode or env.decay_mode or "exponential").lower()
+    window_days = env.decay_window_days or (rules.decay_window_days or 0.0)
+    need_owner = self_repo_penalty < 1.0 or bool(user_orgs)
+    # resolve the decay branch once; events need an age only if some decay applies
+    exp_decay = decay_mode == "exponential" and lam > 0
+    linear_decay = decay_mode == "linear" and window_days > 0
+    window_cut = decay_mode == "window" and window_days > 0
+    need_age = exp_decay or linear_decay or window_cut
+    neg_lam = -lam
+    kind_weights = rules.by_kind
+    now = datetime.now(UTC)
+    day_key_of = _day_key
     for ev in events:
-        kind = ev.kind.value if hasattr(ev.kind, "value") else str(ev.kind)
-        # created_at is datetime (Pydantic parses), guard just in case
         try:
-            day_key = ev.created_at.date().isoformat()
-        except Exception:
-            day_key = ""
+            kind = ev.kind.value
+        except AttributeError:  # plain-string kinds from unvalidated events
+            kind = str(ev.kind)
+        day_key = day_key_of(ev.created_at)
         if day_key and kind in fair_default:
             key = (ev.user_id, kind, day_key)
             counters[key] += 1
             if counters[key] > fair_default.get(kind, 10):
                 # clip: ignore beyond daily cap
                 continue
-        for dim, spec in rules.dimensions.items():
-            if kind in spec.get("kinds", set()):
-                w = spec.get("weights_by_kind", {}).get(kind, spec.get("weight", 1.0))
-                # penalize self-repo events if configured
-                try:
-                    _, owner, _ = (ev.repo_id or "///").split("/", 2)
-                except Exception:
-                    owner = ""
-                if (
-                    self_repo_penalty < 1.0
-                    and owner
-                    and ev.user_id
-                    and ev.user_id.lower() == owner.lower()
-                ):
-                    w *= self_repo_penalty
-                # penalize org-owned repos if configured
-                if user_orgs and owner and owner.lower() in user_orgs:
-                    try:
-                        org_penalty = float(os.getenv("OSSMK_ORG_REPO_PENALTY", "1.0"))
-                    except Exception:
-                        org_penalty = 1.0
-                    w *= org_penalty
-                # apply decay by event age
-                if getattr(ev, "created_at", None):
-                    try:
-                        age_days = (datetime.now(UTC) - ev.created_at).total_seconds() / 86400.0
-                        if decay_mode == "exponential" and lam > 0:
-                            w *= exp(-lam * age_days)
-                        elif decay_mode == "linear" and window_days > 0:
-                            # linearly drop to zero at window_days
-                            w *= max(0.0, 1.0 - (age_days / window_days))
-                        elif decay_mode == "window" and window_days > 0:
-                            # count only within window
-                            if age_days > window_days:
-                                continue
-                    except Exception:
-                        pass
-                scores[ev.user_id][dim] += float(w)
-    # flatten
-    out: list[ScoreEntry] = []
-    for user, dims in scores.items():
-        for dim, val in dims.items():
-            out.append(ScoreEntry(user_id=user, dimension=dim, value=float(val), window="all"))
-    return out
+        targets = kind_weights.get(kind)
+        if not targets:
+            continue
+        # per-event multiplier: repo-ownership penalties and decay, shared by all dims
+        factor = 1.0
+        if need_owner:
+            # repo_id is "host/owner/name"; partition avoids split's list allocation
+            _, _, rest = (ev.repo_id or "").partition("/")
+            owner, sep, _ = rest.partition("/")
+            owner_l = owner.lower() if sep else ""
+        else:
+            owner_l = ""
+        if owner_l:
+            # penalize self-repo events if configured
+            if self_repo_penalty < 1.0 and ev.user_id and ev.user_id.lower() == owner_l:
+                factor *= self_repo_penalty
+            # penalize org-owned repos if configured
+            if user_orgs and owner_l in user_orgs:
+                factor *= org_penalty
+        # apply decay by event age (same factor for every dimension)
+        if need_age and getattr(ev, "created_at", None):
+            try:
+                age_days = (now - ev.created_at).total_seconds() / 86400.0
+                if exp_decay:
+                    factor *= exp(neg_lam * age_days)
+                elif linear_decay:
+                    # linearly drop to zero at window_days
+                    factor *= max(0.0, 1.0 - (age_days / window_days))
+                elif age_days > window_days:
+                    # window: count only within window
+                    continue
+            except Exception:
+                pass
+        user = ev.user_id
+        for dim, w in targets:
+            scores[(user, dim)] += float(w * factor)
+    # flatten, grouped by user in first-seen order
+    by_user: dict[str, list[tuple[tuple[str, str], float]]] = {}
+    for item in scores.items():
+        by_user.setdefault(item[0][0], []).append(item)
+    return [item for items in by_user.values() for item in items]
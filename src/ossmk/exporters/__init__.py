@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+from typing import Any
+
 from .json import write_json
 
-try:
-    from .parquet import write_parquet  # type: ignore
-except Exception:  # pragma: no cover
-    write_parquet = None  # type: ignore
+
+def __getattr__(name: str) -> Any:
+    # pyarrow is heavy to import; resolve the Parquet exporter on first access only.
+    if name == "write_parquet":
+        try:
+            from .parquet import write_parquet  # type: ignore
+        except Exception:  # pragma: no cover
+            return None
+        return write_parquet
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["write_json", "write_parquet"]
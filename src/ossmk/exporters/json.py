@@ -2,16 +2,71 @@ from __future__ import annotations
 
 import json
 import sys
-from typing import Any
+from collections.abc import Iterable
+from typing import IO, Any, cast
+
+try:  # optional fast path
+    import orjson as _orjson  # type: ignore[reportMissingImports]
+    orjson: Any | None = cast(Any, _orjson)
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 
 def write_json(data: Any, out: str = "-") -> None:
-    buf = json.dumps(data, ensure_ascii=False, indent=2, default=str)
+    if orjson is not None:
+        raw: bytes = orjson.dumps(
+            data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+        if out == "-":
+            sys.stdout.flush()
+            sys.stdout.buffer.write(raw)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.buffer.flush()
+        else:
+            with open(out, "wb") as f:
+                f.write(raw)
+        return
+    # json.dump encodes chunk by chunk into the stream; no full-document string
     if out == "-":
-        sys.stdout.write(buf + "\n")
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write("\n")
     else:
         with open(out, "w", encoding="utf-8") as f:
-            f.write(buf)
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+
+
+def _dumps_item(item: Any) -> bytes:
+    if orjson is not None:
+        return cast(
+            bytes,
+            orjson.dumps(item, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS),
+        )
+    return json.dumps(item, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+
+def _write_array(items: Iterable[Any], f: IO[bytes]) -> None:
+    first = True
+    for item in items:
+        # nest the element one level deep to match json.dumps(list, indent=2)
+        f.write((b"[\n  " if first else b",\n  ") + _dumps_item(item).replace(b"\n", b"\n  "))
+        first = False
+    f.write(b"[]" if first else b"\n]")
+
+
+def write_json_stream(items: Iterable[Any], out: str = "-") -> None:
+    """Write items as a JSON array one element at a time.
+
+    Produces the same document as `write_json(list(items))` without holding the
+    whole list or its serialized form in memory.
+    """
+    if out == "-":
+        sys.stdout.flush()
+        _write_array(items, sys.stdout.buffer)
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        with open(out, "wb") as f:
+            _write_array(items, f)
 
 
 def exporter(*args: Any, **kwargs: Any) -> None:  # noqa: D401
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, cast
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, cast
 
 try:  # optional dependency
     import pyarrow as pa  # type: ignore[reportMissingImports]
@@ -9,21 +10,104 @@ except Exception:  # pragma: no cover
     pa = None  # type: ignore
     pq = None  # type: ignore
 
+if TYPE_CHECKING:
+    from ossmk.core.models import ContributionEvent
+    from ossmk.core.services.score import ScoreEntry
+
+
+# Rows per row group when streaming large inputs through a ParquetWriter.
+PARQUET_CHUNK_ROWS = 65536
+_WRITE_OPTIONS: dict[str, Any] = {
+    "compression": "zstd",
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+
 
 def write_parquet(rows: list[dict[str, Any]], out_path: str) -> None:
     if pa is None or pq is None:  # guard for type checker and optional dep
         raise RuntimeError("pyarrow is not installed")
+    pa_mod = cast(Any, pa)
+    pq_mod = cast(Any, pq)
     if not rows:
         # create empty file with no rows
-        pa_mod = cast(Any, pa)
-        pq_mod = cast(Any, pq)
         table: Any = pa_mod.table({})
-        pq_mod.write_table(table, out_path)
+        pq_mod.write_table(table, out_path, **_WRITE_OPTIONS)
         return
     # unify keys
     keys = sorted({k for r in rows for k in r.keys()})
-    arrays = {k: [r.get(k) for r in rows] for k in keys}
+    if len(rows) <= PARQUET_CHUNK_ROWS:
+        table = pa_mod.table({k: [r.get(k) for r in rows] for k in keys})
+        pq_mod.write_table(table, out_path, **_WRITE_OPTIONS)
+        return
+    # Large inputs: fix the schema up front, then transpose and write one row group at a time.
+    schema = _infer_schema(rows, keys)
+    with pq_mod.ParquetWriter(out_path, schema, **_WRITE_OPTIONS) as writer:
+        for start in range(0, len(rows), PARQUET_CHUNK_ROWS):
+            chunk = rows[start : start + PARQUET_CHUNK_ROWS]
+            arrays = {k: [r.get(k) for r in chunk] for k in keys}
+            writer.write_table(pa_mod.table(arrays, schema=schema))
+
+
+def _infer_schema(rows: list[dict[str, Any]], keys: list[str]) -> Any:
+    pa_mod = cast(Any, pa)
+    head = rows[:PARQUET_CHUNK_ROWS]
+    schema: Any = pa_mod.table({k: [r.get(k) for r in head] for k in keys}).schema
+    for i, f in enumerate(schema):
+        if pa_mod.types.is_null(f.type):
+            # all-null in the first chunk; type the column from its first value, if any
+            sample = next((r[f.name] for r in rows if r.get(f.name) is not None), None)
+            if sample is not None:
+                schema = schema.set(i, pa_mod.field(f.name, pa_mod.array([sample]).type))
+    return schema
+
+
+def write_events_parquet(events: Sequence[ContributionEvent], out_path: str) -> None:
+    """Write events column by column (no intermediate list of row dicts)."""
+    if pa is None or pq is None:
+        raise RuntimeError("pyarrow is not installed")
+    pa_mod = cast(Any, pa)
+    pq_mod = cast(Any, pq)
+    string = pa_mod.string()
+    table: Any = pa_mod.Table.from_arrays(
+        [
+            pa_mod.array([e.id for e in events], type=string),
+            pa_mod.array([getattr(e.kind, "value", str(e.kind)) for e in events], type=string),
+            pa_mod.array([e.repo_id for e in events], type=string),
+            pa_mod.array([e.user_id for e in events], type=string),
+            pa_mod.array(
+                [e.created_at for e in events], type=pa_mod.timestamp("us", tz="UTC")
+            ),
+            pa_mod.array([e.lines_added for e in events], type=pa_mod.int64()),
+            pa_mod.array([e.lines_removed for e in events], type=pa_mod.int64()),
+        ],
+        names=[
+            "id",
+            "kind",
+            "repo_id",
+            "user_id",
+            "created_at",
+            "lines_added",
+            "lines_removed",
+        ],
+    )
+    pq_mod.write_table(table, out_path, **_WRITE_OPTIONS)
+
+
+def write_scores_parquet(scores: Sequence[ScoreEntry], out_path: str) -> None:
+    """Write score entries as typed columns (same column order as `write_parquet`)."""
+    if pa is None or pq is None:
+        raise RuntimeError("pyarrow is not installed")
     pa_mod = cast(Any, pa)
     pq_mod = cast(Any, pq)
-    table: Any = pa_mod.table(arrays)
-    pq_mod.write_table(table, out_path)
+    string = pa_mod.string()
+    table: Any = pa_mod.Table.from_arrays(
+        [
+            pa_mod.array([s["dimension"] for s in scores], type=string),
+            pa_mod.array([s["user_id"] for s in scores], type=string),
+            pa_mod.array([s["value"] for s in scores], type=pa_mod.float64()),
+            pa_mod.array([s["window"] for s in scores], type=string),
+        ],
+        names=["dimension", "user_id", "value", "window"],
+    )
+    pq_mod.write_table(table, out_path, **_WRITE_OPTIONS)
@@ -38,7 +38,11 @@ LATENCY: Any | None = (
 
 @contextmanager
 def record(op: str):
-    start = time.time()
+    if REQUESTS is None and LATENCY is None and trace is None:
+        # no metrics backend installed: nothing to time or label
+        yield
+        return
+    start = time.monotonic()
     try:
         if trace is not None:
             tracer: Any = cast(Any, trace).get_tracer("ossmk")
@@ -47,7 +51,7 @@ def record(op: str):
         else:
             yield
     finally:
-        dur = time.time() - start
+        dur = time.monotonic() - start
         if REQUESTS:
             REQUESTS.labels(op=op).inc()
         if LATENCY:
@@ -3,8 +3,24 @@ from __future__ import annotations
 import asyncio
 import json
 import os
-from datetime import UTC, datetime
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    asynccontextmanager,
+    nullcontext,
+)
+from contextvars import ContextVar
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from itertools import chain, islice
 from typing import Any, cast
+from urllib.parse import quote_plus
 
 import httpx
 from dateutil import parser as dateutil_parser
@@ -12,96 +28,498 @@ from dateutil import parser as dateutil_parser
 from ossmk.core.models import ContributionEvent, EventKind
 from ossmk.storage.sqlite import HttpCache
 from ossmk.utils import (
+    RateLimitExceeded,
     github_auth_headers,
     http_async_client,
     http_client,
     http_get,
     http_get_async,
+    http_post_async,
     is_bot_login,
+    parse_link_last,
     parse_link_next,
     parse_since,
     utcnow_iso,
 )
 
 
+try:  # optional fast JSON parsing
+    import orjson as _orjson  # type: ignore[reportMissingImports]
+    _json_loads: Any = cast(Any, _orjson).loads
+except Exception:  # pragma: no cover
+    _json_loads = json.loads
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Reuse auth headers this long; GitHub App installation tokens are valid for one hour.
+AUTH_HEADERS_TTL_SECONDS = 50 * 60
+# Decoded REST pages kept per (url, ETag) so 304 hits skip JSON parsing; bounded by the
+# total size of their JSON bodies, least recently used evicted first.
+PARSED_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Pages of one listing requested at once when the Link header reveals the last page.
+PAGE_CONCURRENCY = 6
+
+# Cursor-paginated search for PRs and Issues; the login only travels in `$q`, so the
+# query text is byte-identical for every user and page.
+_SEARCH_QUERY = (
+    "query($q:String!, $after:String){"
+    "  search(type: ISSUE, query: $q, first: 100, after: $after){"
+    "    pageInfo{ hasNextPage endCursor }"
+    "    nodes {"
+    "      ... on PullRequest { __typename id number repository { nameWithOwner } "
+    "author { login } createdAt }"
+    "      ... on Issue { __typename id number repository { nameWithOwner } "
+    "author { login } createdAt }"
+    "    }"
+    "  }"
+    "}"
+)
+
+
+def _page_param(url: str | None) -> int | None:
+    if not url:
+        return None
+    page = httpx.URL(url).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+
+@lru_cache(maxsize=256)
+def _repo_ref(repo: str) -> tuple[str, str, str]:
+    """(owner, name, interned repo_id) for an "owner/name"; shared by every fetch of a repo."""
+    owner, name = repo.split("/", 1)
+    return owner, name, sys.intern(f"github.com/{owner}/{name}")
+
+
+@lru_cache(maxsize=64)
+def _commits_params(iso_since: str | None) -> str:
+    """Query string for the commits endpoint; built once per distinct cutoff."""
+    if not iso_since:
+        return "per_page=100"
+    return f"per_page=100&since={quote_plus(iso_since)}"
+
+
+@lru_cache(maxsize=64)
+def _issues_params(iso_since: str | None) -> str:
+    """Query string for the issues endpoint; `since` limits it to recently updated items."""
+    if not iso_since:
+        return "state=all&per_page=100"
+    return f"state=all&per_page=100&sort=updated&direction=desc&since={quote_plus(iso_since)}"
+
+
+# Event kinds bound once; per-row code reads module globals instead of enum attributes.
+_KIND_PR = EventKind.pr
+_KIND_ISSUE = EventKind.issue
+_KIND_COMMIT = EventKind.commit
+_KIND_REVIEW = EventKind.review
+
+
+def _commit_author_and_date(c: dict[str, Any]) -> tuple[str, Any]:
+    """(login, authored date) of a REST commit item, without fallback temporaries."""
+    author = c.get("author")
+    login = author.get("login") if author else None
+    if not login:
+        committer = c.get("committer")
+        login = committer.get("login") if committer else None
+    commit = c.get("commit")
+    meta = commit.get("author") if commit else None
+    return login or "unknown", meta.get("date") if meta else None
+
+
+# One repository's issues, PRs (with reviews on the first page) and default-branch commits.
+# Each connection pages independently; @include drops exhausted ones from later requests.
+_REPO_PAGE_FRAGMENT = (
+    "fragment RepoPage on Repository{"
+    "  issues(first:100, after:$issuesAfter, filterBy:{since:$since}) @include(if:$issues){"
+    "    pageInfo{ hasNextPage endCursor }"
+    "    nodes{ id createdAt author{ login } }"
+    "  }"
+    "  pullRequests(first:50, after:$prsAfter, orderBy:{field:UPDATED_AT, direction:DESC})"
+    " @include(if:$prs){"
+    "    pageInfo{ hasNextPage endCursor }"
+    "    nodes{ id createdAt updatedAt author{ login }"
+    "      reviews(first:100) @include(if:$reviews){ nodes{ id author{ login } submittedAt } }"
+    "    }"
+    "  }"
+    "  defaultBranchRef @include(if:$commits){"
+    "    target{ ... on Commit{ history(first:100, after:$commitsAfter, since:$gitSince){"
+    "      pageInfo{ hasNextPage endCursor }"
+    "      nodes{ oid committedDate author{ user{ login } } }"
+    "    } } }"
+    "  }"
+    "}"
+)
+_REPO_PAGE_VARS = (
+    "$since:DateTime, $gitSince:GitTimestamp, $issues:Boolean!, $issuesAfter:String,"
+    " $prs:Boolean!, $prsAfter:String, $reviews:Boolean!, $commits:Boolean!,"
+    " $commitsAfter:String"
+)
+_REPO_ALL_QUERY = (
+    f"query($owner:String!, $name:String!, {_REPO_PAGE_VARS}){{"
+    "  repository(owner:$owner, name:$name){ ...RepoPage }"
+    f"}}{_REPO_PAGE_FRAGMENT}"
+)
+# Repositories whose first RepoPage is requested together in one aliased query.
+GRAPHQL_REPO_BATCH = 10
+
+
+@lru_cache(maxsize=GRAPHQL_REPO_BATCH)
+def _repo_batch_query(n: int) -> str:
+    """First RepoPage of `n` repositories, aliased r0..r{n-1} (owners/names in $o{i}/$n{i})."""
+    params = "".join(f"$o{i}:String!, $n{i}:String!, " for i in range(n))
+    fields = " ".join(
+        f"r{i}: repository(owner:$o{i}, name:$n{i}){{ ...RepoPage }}" for i in range(n)
+    )
+    return f"query({params}{_REPO_PAGE_VARS}){{ {fields} }}{_REPO_PAGE_FRAGMENT}"
+
+
+# contributionsCollection accepts at most one year between `from` and `to`.
+CONTRIBUTIONS_WINDOW = timedelta(days=365)
+
+_USER_PROFILE_QUERY = "query($login:String!){ user(login:$login){ id login createdAt } }"
+
+# One page of a user's contributions in a [from, to] window; each connection has its own
+# include flag and cursor so exhausted ones drop out of later pages.
+_CONTRIBUTIONS_QUERY = (
+    "query($login:String!, $from:DateTime!, $to:DateTime!, $commits:Boolean!,"
+    " $pr:Boolean!, $prAfter:String, $issue:Boolean!, $issueAfter:String,"
+    " $review:Boolean!, $reviewAfter:String){"
+    "  user(login:$login){"
+    "    contributionsCollection(from:$from, to:$to){"
+    "      commitContributionsByRepository(maxRepositories:100) @include(if:$commits){"
+    "        repository{ nameWithOwner }"
+    "      }"
+    "      pullRequestContributions(first:100, after:$prAfter) @include(if:$pr){"
+    "        pageInfo{ hasNextPage endCursor }"
+    "        nodes{ pullRequest{ id createdAt repository{ nameWithOwner } } }"
+    "      }"
+    "      issueContributions(first:100, after:$issueAfter) @include(if:$issue){"
+    "        pageInfo{ hasNextPage endCursor }"
+    "        nodes{ issue{ id createdAt repository{ nameWithOwner } } }"
+    "      }"
+    "      pullRequestReviewContributions(first:100, after:$reviewAfter)"
+    " @include(if:$review){"
+    "        pageInfo{ hasNextPage endCursor }"
+    "        nodes{ pullRequestReview{ id submittedAt } repository{ nameWithOwner } }"
+    "      }"
+    "    }"
+    "  }"
+    "}"
+)
+
+# A user's commits on a repository's default branch (the branch contributions count).
+_USER_COMMITS_QUERY = (
+    "query($owner:String!, $name:String!, $author:ID!, $since:GitTimestamp,"
+    " $until:GitTimestamp, $after:String){"
+    "  repository(owner:$owner, name:$name){"
+    "    defaultBranchRef{ target{ ... on Commit{"
+    "      history(first:100, after:$after, author:{id:$author}, since:$since, until:$until){"
+    "        pageInfo{ hasNextPage endCursor }"
+    "        nodes{ oid committedDate }"
+    "      }"
+    "    } } }"
+    "  }"
+    "}"
+)
+
+
+# Async client shared by the fetches of one crawl (see GitHubProvider._shared_aclient).
+_SHARED_ACLIENT: ContextVar[httpx.AsyncClient | None] = ContextVar(
+    "ossmk_github_aclient", default=None
+)
+
+
 class GitHubProvider:
+    """GitHub REST/GraphQL provider.
+
+    Events are built with `model_construct`: every field is produced here already in its
+    declared type, so per-row pydantic validation is skipped.
+    """
+
     id = "github"
 
     def __init__(self) -> None:
         self.cache = HttpCache()
+        self._headers: dict[str, str] | None = None
+        self._headers_expiry = 0.0
+        # long-lived processes whose token rotates underneath them can opt out of the memo
+        self._refresh_headers = os.getenv("OSSMK_REFRESH_TOKEN") == "1"
+        self._parsed: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._parsed_bytes = 0
+        self._parsed_lock = threading.Lock()
+        # single-flight fetches per async client, cancelled when that client's block exits
+        self._inflight: dict[httpx.AsyncClient, dict[str, asyncio.Future[Any]]] = {}
+        self._sync_client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
+
+    def _client(self) -> AbstractContextManager[httpx.Client]:
+        """Provider-wide sync client, created once and kept open so connections are reused."""
+        with self._client_lock:
+            if self._sync_client is None:
+                self._sync_client = http_client()
+        return nullcontext(self._sync_client)
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+        self.cache.close()
+
+    def _aclient(self) -> AbstractAsyncContextManager[httpx.AsyncClient]:
+        """The current crawl's shared async client, or a fresh one closed on exit."""
+        shared = _SHARED_ACLIENT.get()
+        if shared is not None:
+            return nullcontext(shared)
+        return self._owned_aclient()
+
+    @asynccontextmanager
+    async def _owned_aclient(self) -> AsyncIterator[httpx.AsyncClient]:
+        async with http_async_client() as client:
+            try:
+                yield client
+            finally:
+                await self._drain_inflight(client)
+
+    async def _drain_inflight(self, client: httpx.AsyncClient) -> None:
+        """Cancel fetches still running on `client` (their waiters are gone) before it closes."""
+        tasks = list(self._inflight.pop(client, {}).values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @asynccontextmanager
+    async def _shared_aclient(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Make one async client the shared client for every fetch started inside the block.
+
+        Kept in a context variable rather than on the provider: async clients are bound to
+        the event loop that created them, and the provider outlives `asyncio.run` calls.
+        """
+        shared = _SHARED_ACLIENT.get()
+        if shared is not None:
+            yield shared
+            return
+        async with http_async_client() as client:
+            token = _SHARED_ACLIENT.set(client)
+            try:
+                yield client
+            finally:
+                _SHARED_ACLIENT.reset(token)
+                await self._drain_inflight(client)
+                # end of the crawl: commit whatever the response cache still buffers
+                await asyncio.to_thread(self.cache.flush)
 
     def _auth_headers(self) -> dict[str, str]:
-        return github_auth_headers()
+        """Auth headers, resolved once per TTL (App tokens cost a network round trip).
+
+        The returned dict is shared; copy it before adding per-request headers.
+        """
+        now = time.monotonic()
+        if self._headers is None or now >= self._headers_expiry or self._refresh_headers:
+            self._headers = github_auth_headers()
+            self._headers_expiry = now + AUTH_HEADERS_TTL_SECONDS
+        return self._headers
 
     @staticmethod
     def _parse_dt(val: Any) -> datetime:
-        from datetime import datetime as _dt
-        if isinstance(val, _dt):
+        if isinstance(val, datetime):
             return val
+        if isinstance(val, str):
+            try:
+                # C parser; accepts GitHub's "2024-01-02T03:04:05Z" form on 3.11+
+                return datetime.fromisoformat(val)
+            except ValueError:
+                pass
         try:
             return dateutil_parser.isoparse(str(val))
         except Exception:
-            return _dt.now(UTC)
+            return datetime.now(UTC)
+
+    def _parse_page(self, url: str, etag: str | None, body: str | bytes) -> Any:
+        """Decode a page body, reusing the decoded page of an earlier hit on (url, ETag).
+
+        Pages are read-only to callers, so one decoded page can be shared between hits.
+        """
+        if not etag:
+            return _json_loads(body)
+        key = (url, etag)
+        with self._parsed_lock:
+            hit = self._parsed.get(key)
+            if hit is not None:
+                self._parsed.move_to_end(key)
+                return hit[0]
+        data = _json_loads(body)
+        size = len(body)
+        if size > PARSED_CACHE_MAX_BYTES:
+            return data
+        with self._parsed_lock:
+            old = self._parsed.pop(key, None)
+            if old is not None:
+                self._parsed_bytes -= old[1]
+            self._parsed[key] = (data, size)
+            self._parsed_bytes += size
+            while self._parsed_bytes > PARSED_CACHE_MAX_BYTES:
+                _, (_, evicted) = self._parsed.popitem(last=False)
+                self._parsed_bytes -= evicted
+        return data
 
     def _cached_get_json(
         self, client: httpx.Client, url: str
     ) -> tuple[list[dict[str, Any]], str | None, httpx.Response]:
         headers = self._auth_headers()
         cached = self.cache.get(url)
-        if cached and cached.get("etag"):
-            headers["If-None-Match"] = cached["etag"]
+        cached_etag = cached.get("etag") if cached else None
+        if cached_etag:
+            headers = {**headers, "If-None-Match": cached_etag}
         resp = http_get(client, url, headers=headers)
+        resp_headers = resp.headers
         if resp.status_code == 304 and cached:
             body = cached["body"]
+            etag = cached_etag
         else:
             resp.raise_for_status()
-            body = resp.text
-            etag = resp.headers.get("ETag")
-            last_modified = resp.headers.get("Last-Modified")
+            body = resp.content
+            etag = resp_headers.get("ETag")
+            last_modified = resp_headers.get("Last-Modified")
             self.cache.set(url, etag, last_modified, body, utcnow_iso())
-        data = json.loads(body)
-        next_url = parse_link_next(resp.headers.get("Link"))
+        data = self._parse_page(url, etag, body)
+        next_url = parse_link_next(resp_headers.get("Link"))
         return data, next_url, resp
 
     async def _cached_get_json_async(
-        self, client: httpx.AsyncClient, url: str
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        cached_rows: dict[str, dict[str, Any]] | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None, httpx.Response]:
+        # Concurrent requests for the same URL on the same client share one fetch.
+        flights = self._inflight.setdefault(client, {})
+        task = flights.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._get_json_async(client, url, cached_rows))
+            flights[url] = task
+
+            def landed(_: asyncio.Future[Any]) -> None:
+                flights.pop(url, None)
+                if not flights and self._inflight.get(client) is flights:
+                    del self._inflight[client]
+
+            task.add_done_callback(landed)
+        # shield: one waiter being cancelled must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _get_json_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        cached_rows: dict[str, dict[str, Any]] | None = None,
     ) -> tuple[list[dict[str, Any]], str | None, httpx.Response]:
+        """Fetch one page; `cached_rows` is a `HttpCache.get_many` result to look `url` up in."""
         headers = self._auth_headers()
-        cached = self.cache.get(url)
-        if cached and cached.get("etag"):
-            headers["If-None-Match"] = cached["etag"]
+        cached = await self.cache.aget(url) if cached_rows is None else cached_rows.get(url)
+        cached_etag = cached.get("etag") if cached else None
+        if cached_etag:
+            headers = {**headers, "If-None-Match": cached_etag}
         resp = await http_get_async(client, url, headers=headers)
+        resp_headers = resp.headers
         if resp.status_code == 304 and cached:
             body = cached["body"]
+            etag = cached_etag
         else:
             resp.raise_for_status()
-            body = resp.text
-            etag = resp.headers.get("ETag")
-            last_modified = resp.headers.get("Last-Modified")
-            self.cache.set(url, etag, last_modified, body, utcnow_iso())
-        data = json.loads(body)
-        next_url = parse_link_next(resp.headers.get("Link"))
+            body = resp.content
+            etag = resp_headers.get("ETag")
+            last_modified = resp_headers.get("Last-Modified")
+            await self.cache.aset(url, etag, last_modified, body, utcnow_iso())
+        data = self._parse_page(url, etag, body)
+        next_url = parse_link_next(resp_headers.get("Link"))
         return data, next_url, resp
 
-    def fetch_repo_issues_and_prs(self, repo: str) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
-        base_url = f"https://api.github.com/repos/{owner}/{name}/issues?state=all&per_page=100"
+    async def _post_graphql(
+        self, client: httpx.AsyncClient, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        """POST a GraphQL query and return its `data` object."""
+        resp = await http_post_async(client, GRAPHQL_URL, self._auth_headers(), payload)
+        resp.raise_for_status()
+        decoded = cast(dict[str, Any], _json_loads(resp.content))
+        return cast(dict[str, Any], decoded.get("data") or {})
+
+    async def _pages_async(
+        self, client: httpx.AsyncClient, url: str, metric: str | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the pages of a paginated endpoint in order.
+
+        When page 1 links a `rel="last"` page, pages 2..last are fetched through a sliding
+        window of at most PAGE_CONCURRENCY requests, topped up as each page is yielded;
+        otherwise page N+1 is requested while page N is consumed.
+        """
+        from ossmk.metrics import record
+
+        async def get(
+            u: str, cached_rows: dict[str, dict[str, Any]] | None = None
+        ) -> tuple[list[dict[str, Any]], str | None, httpx.Response]:
+            if metric is None:
+                return await self._cached_get_json_async(client, u, cached_rows)
+            with record(metric):
+                return await self._cached_get_json_async(client, u, cached_rows)
+
+        pending: deque[asyncio.Future[Any]] = deque()
+        try:
+            data, next_url, resp = await get(url)
+            last = _page_param(parse_link_last(resp.headers.get("Link")))
+            if next_url and last is not None and last > 2:
+                base = httpx.URL(next_url)
+                urls = [str(base.copy_set_param("page", k)) for k in range(2, last + 1)]
+                # one cache query for the whole range instead of one per page
+                rows = await self.cache.aget_many(urls)
+                queued = iter(urls)
+                pending.extend(
+                    asyncio.ensure_future(get(u, rows))
+                    for u in islice(queued, PAGE_CONCURRENCY)
+                )
+                yield data
+                while pending:
+                    data, _, _ = await pending[0]
+                    pending.popleft()
+                    u = next(queued, None)
+                    if u is not None:
+                        pending.append(asyncio.ensure_future(get(u, rows)))
+                    yield data
+                return
+            if next_url:
+                pending.append(asyncio.ensure_future(get(next_url)))
+            yield data
+            while pending:
+                data, next_url, _ = await pending[0]
+                pending.popleft()
+                if next_url:
+                    pending.append(asyncio.ensure_future(get(next_url)))
+                yield data
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+    def fetch_repo_issues_and_prs(
+        self, repo: str, since: str | None = None
+    ) -> list[ContributionEvent]:
+        owner, name, repo_id = _repo_ref(repo)
+        params = _issues_params(parse_since(since))
+        base_url = f"https://api.github.com/repos/{owner}/{name}/issues?{params}"
         events: list[ContributionEvent] = []
         from ossmk.metrics import record
-        with http_client() as client:
+        with self._client() as client:
             url = base_url
             while True:
                 with record("github.issues_prs"):
                     data, next_url, _ = self._cached_get_json(client, url)
                 for item in data:
-                    kind = EventKind.pr if "pull_request" in item else EventKind.issue
+                    kind = _KIND_PR if "pull_request" in item else _KIND_ISSUE
                     user = cast(dict[str, Any], item.get("user") or {})
                     events.append(
-                        ContributionEvent(
+                        ContributionEvent.model_construct(
                             id=str(item["id"]),
                             kind=kind,
-                            repo_id=f"github.com/{owner}/{name}",
-                            user_id=str(user.get("login") or "unknown"),
+                            repo_id=repo_id,
+                            user_id=sys.intern(str(user.get("login") or "unknown")),
                             created_at=self._parse_dt(item.get("created_at")),
                             lines_added=0,
                             lines_removed=0,
@@ -113,39 +531,28 @@ class GitHubProvider:
         return events
 
     def fetch_repo_commits(self, repo: str, since: str | None = None) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
-        params = "per_page=100"
-        iso_since = parse_since(since)
-        if iso_since:
-            qp = httpx.QueryParams({"since": iso_since})
-            params += f"&{qp}"
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
+        params = _commits_params(parse_since(since))
         base_url = f"https://api.github.com/repos/{owner}/{name}/commits?{params}"
         events: list[ContributionEvent] = []
         from ossmk.metrics import record
-        with http_client() as client:
+        with self._client() as client:
             url = base_url
             while True:
                 with record("github.commits"):
                     data, next_url, _ = self._cached_get_json(client, url)
                 for c in data:
-                    author = (
-                        cast(dict[str, Any], c.get("author") or {}).get("login")
-                        or cast(dict[str, Any], c.get("committer") or {}).get("login")
-                        or "unknown"
-                    )
-                    if os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1" and is_bot_login(author):
+                    author, date = _commit_author_and_date(c)
+                    if exclude_bots and is_bot_login(author):
                         continue
                     events.append(
-                        ContributionEvent(
+                        ContributionEvent.model_construct(
                             id=str(c.get("sha")),
-                            kind=EventKind.commit,
-                            repo_id=f"github.com/{owner}/{name}",
-                            user_id=str(author),
-                            created_at=self._parse_dt(
-                                cast(dict[str, Any], c.get("commit") or {})
-                                .get("author", {})
-                                .get("date")
-                            ),
+                            kind=_KIND_COMMIT,
+                            repo_id=repo_id,
+                            user_id=sys.intern(str(author)),
+                            created_at=self._parse_dt(date),
                             lines_added=0,
                             lines_removed=0,
                         )
@@ -156,20 +563,21 @@ class GitHubProvider:
         return events
 
     def fetch_repo_pr_reviews(self, repo: str, max_prs: int | None = 50) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
         pr_url = f"https://api.github.com/repos/{owner}/{name}/pulls?state=all&per_page=100&sort=updated"
         events: list[ContributionEvent] = []
-        prs: list[dict[str, Any]] = []
-        with http_client() as client:
+        # only the PR numbers are needed; don't keep whole PR payloads alive
+        pr_numbers: list[Any] = []
+        with self._client() as client:
             url = pr_url
-            while True and (max_prs is None or len(prs) < max_prs):
+            while True and (max_prs is None or len(pr_numbers) < max_prs):
                 data, next_url, _ = self._cached_get_json(client, url)
-                prs.extend(data)
-                if not next_url or (max_prs is not None and len(prs) >= max_prs):
+                pr_numbers.extend(pr.get("number") for pr in data)
+                if not next_url or (max_prs is not None and len(pr_numbers) >= max_prs):
                     break
                 url = next_url
-            for pr in prs[: (max_prs or len(prs))]:
-                num = pr.get("number")
+            for num in pr_numbers[: (max_prs or len(pr_numbers))]:
                 if not num:
                     continue
                 reviews_url = f"https://api.github.com/repos/{owner}/{name}/pulls/{num}/reviews?per_page=100"
@@ -179,14 +587,14 @@ class GitHubProvider:
                     for rv in data:
                         user_dict = cast(dict[str, Any], rv.get("user") or {})
                         user = cast(str, user_dict.get("login") or "unknown")
-                        if os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1" and is_bot_login(user):
+                        if exclude_bots and is_bot_login(user):
                             continue
                         events.append(
-                            ContributionEvent(
+                            ContributionEvent.model_construct(
                                 id=str(rv.get("id")),
-                                kind=EventKind.review,
-                                repo_id=f"github.com/{owner}/{name}",
-                                user_id=str(user),
+                                kind=_KIND_REVIEW,
+                                repo_id=repo_id,
+                                user_id=sys.intern(str(user)),
                                 created_at=self._parse_dt(
                                     rv.get("submitted_at") or rv.get("created_at")
                                 ),
@@ -201,214 +609,589 @@ class GitHubProvider:
 
     def fetch_user_repos(self, login: str) -> list[str]:
         url = f"https://api.github.com/users/{login}/repos?per_page=100&type=owner&sort=updated"
-        with http_client() as client:
+        with self._client() as client:
             data, _, _ = self._cached_get_json(client, url)
         full_names = [item.get("full_name") for item in data if item.get("full_name")]
         return [str(x) for x in full_names]
 
+    async def _fetch_user_repos_async(self, login: str) -> list[str]:
+        url = f"https://api.github.com/users/{login}/repos?per_page=100&type=owner&sort=updated"
+        async with self._aclient() as client:
+            data, _, _ = await self._cached_get_json_async(client, url)
+        full_names = [item.get("full_name") for item in data if item.get("full_name")]
+        return [str(x) for x in full_names]
+
     def fetch_user_contributions(
         self, login: str, max_repos: int | None = 20, since: str | None = None
     ) -> list[ContributionEvent]:
         repos = self.fetch_user_repos(login)
         if max_repos is not None:
             repos = repos[:max_repos]
+        # resolve a relative window once so every repo shares the same cutoff
+        since = parse_since(since)
         all_events: list[ContributionEvent] = []
-        for repo in repos:
-            try:
-                all_events.extend(self.fetch_repo_issues_and_prs(repo))
-                all_events.extend(self.fetch_repo_commits(repo, since=since))
-                all_events.extend(self.fetch_repo_pr_reviews(repo))
-            except httpx.HTTPStatusError:
-                continue
+        # The workers share one httpx.Client (thread-safe connection pool) and one
+        # HttpCache (a single connection behind its lock); a racing token refresh in
+        # _auth_headers only fetches the same headers twice.
+        try:
+            with ThreadPoolExecutor(max_workers=3) as ex:
+                for repo in repos:
+                    futures = [
+                        ex.submit(self.fetch_repo_issues_and_prs, repo, since=since),
+                        ex.submit(self.fetch_repo_commits, repo, since=since),
+                        ex.submit(self.fetch_repo_pr_reviews, repo),
+                    ]
+                    try:
+                        for fut in futures:
+                            all_events.extend(fut.result())
+                    except httpx.HTTPStatusError:
+                        continue
+        finally:
+            # RateLimitExceeded ends the crawl; keep what was fetched so far cached
+            self.cache.flush()
         return all_events
 
     async def fetch_user_contributions_async(
         self, login: str, max_repos: int | None = 20, since: str | None = None
     ) -> list[ContributionEvent]:
-        repos = self.fetch_user_repos(login)
-        if max_repos is not None:
-            repos = repos[:max_repos]
+        # resolve a relative window once so every repo shares the same cutoff
+        since = parse_since(since)
         try:
             conc = int(os.getenv("OSSMK_CONCURRENCY", "5"))
         except Exception:
             conc = 5
         semaphore = asyncio.Semaphore(max(1, min(conc, 20)))
-        events: list[ContributionEvent] = []
+        # one GraphQL query per page instead of three REST listings per repo
+        use_graphql = os.getenv("OSSMK_USE_GRAPHQL") == "1"
+        first_pages: dict[str, dict[str, Any]] = {}
+        rate_limited: list[RateLimitExceeded] = []
 
-        async def fetch_repo(repo: str) -> None:
+        async def fetch_repo(repo: str) -> list[ContributionEvent]:
             async with semaphore:
                 try:
-                    e1 = await self._fetch_repo_commits_async(repo, since=since)
-                    e2 = await self._fetch_repo_reviews_async(repo)
-                    e0 = self.fetch_repo_issues_and_prs(repo)
-                    events.extend(e0)
-                    events.extend(e1)
-                    events.extend(e2)
+                    if use_graphql:
+                        return await self._fetch_repo_all_graphql_async(
+                            repo, since=since, first_page=first_pages.get(repo)
+                        )
+                    # issues/PRs, commits and reviews concurrently under one permit
+                    return await self.fetch_repo_all_async(repo, since=since)
+                except RateLimitExceeded as e:
+                    # re-raised once every repo task has finished, as the sync crawl does
+                    rate_limited.append(e)
+                    return []
                 except Exception:
-                    return
+                    return []
+
+        async with self._shared_aclient():
+            # the repo list rides the same pooled client as the crawls that follow
+            repos = await self._fetch_user_repos_async(login)
+            if max_repos is not None:
+                repos = repos[:max_repos]
+            if use_graphql:
+                # first pages of many repos per request; only deeper pages go one by one
+                first_pages = await self._repo_first_pages_graphql_async(repos, since=since)
+            chunks = await asyncio.gather(*(fetch_repo(r) for r in repos))
+            if rate_limited:
+                raise rate_limited[0]
+        # joined once, in repo order
+        return list(chain.from_iterable(chunks))
 
-        await asyncio.gather(*(fetch_repo(r) for r in repos))
+    async def fetch_repo_all_async(
+        self, repo: str, since: str | None = None
+    ) -> list[ContributionEvent]:
+        """Fetch issues/PRs, commits and reviews for one repo concurrently."""
+        async with self._shared_aclient():
+            issues, commits, reviews = await asyncio.gather(
+                self._fetch_repo_issues_and_prs_async(repo, since=since),
+                self._fetch_repo_commits_async(repo, since=since),
+                self._fetch_repo_reviews_async(repo),
+            )
+        return issues + commits + reviews
+
+    async def _fetch_repo_issues_and_prs_async(
+        self, repo: str, since: str | None = None
+    ) -> list[ContributionEvent]:
+        owner, name, repo_id = _repo_ref(repo)
+        params = _issues_params(parse_since(since))
+        base_url = f"https://api.github.com/repos/{owner}/{name}/issues?{params}"
+        events: list[ContributionEvent] = []
+        async with self._aclient() as client:
+            async for data in self._pages_async(client, base_url, "github.issues_prs"):
+                for item in data:
+                    kind = _KIND_PR if "pull_request" in item else _KIND_ISSUE
+                    user = cast(dict[str, Any], item.get("user") or {})
+                    events.append(
+                        ContributionEvent.model_construct(
+                            id=str(item["id"]),
+                            kind=kind,
+                            repo_id=repo_id,
+                            user_id=sys.intern(str(user.get("login") or "unknown")),
+                            created_at=self._parse_dt(item.get("created_at")),
+                            lines_added=0,
+                            lines_removed=0,
+                        )
+                    )
         return events
 
     async def _fetch_repo_commits_async(
         self, repo: str, since: str | None = None
     ) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
-        params = "per_page=100"
-        iso_since = parse_since(since)
-        if iso_since:
-            qp = httpx.QueryParams({"since": iso_since})
-            params += f"&{qp}"
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
+        params = _commits_params(parse_since(since))
         base_url = f"https://api.github.com/repos/{owner}/{name}/commits?{params}"
         events: list[ContributionEvent] = []
-        async with http_async_client() as client:
-            url = base_url
-            while True:
-                data, next_url, _ = await self._cached_get_json_async(client, url)
+        async with self._aclient() as client:
+            async for data in self._pages_async(client, base_url):
                 for c in data:
-                    author = (
-                        cast(dict[str, Any], c.get("author") or {}).get("login")
-                        or cast(dict[str, Any], c.get("committer") or {}).get("login")
-                        or "unknown"
-                    )
+                    author, date = _commit_author_and_date(c)
+                    if exclude_bots and is_bot_login(author):
+                        continue
                     events.append(
-                        ContributionEvent(
+                        ContributionEvent.model_construct(
                             id=str(c.get("sha")),
-                            kind=EventKind.commit,
-                            repo_id=f"github.com/{owner}/{name}",
-                            user_id=str(author),
-                            created_at=self._parse_dt(
-                                cast(dict[str, Any], c.get("commit") or {})
-                                .get("author", {})
-                                .get("date")
-                            ),
+                            kind=_KIND_COMMIT,
+                            repo_id=repo_id,
+                            user_id=sys.intern(str(author)),
+                            created_at=self._parse_dt(date),
                             lines_added=0,
                             lines_removed=0,
                         )
                     )
-                if not next_url:
-                    break
-                url = next_url
         return events
 
     async def _fetch_repo_reviews_async(
         self, repo: str, max_prs: int | None = 50
     ) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
         pr_url = f"https://api.github.com/repos/{owner}/{name}/pulls?state=all&per_page=100&sort=updated"
-        events: list[ContributionEvent] = []
-        prs: list[dict[str, Any]] = []
+        # only the PR numbers are needed; don't keep whole PR payloads alive
+        pr_numbers: list[Any] = []
         from ossmk.metrics import record
-        async with http_async_client() as client:
+        async with self._aclient() as client:
             url = pr_url
-            while True and (max_prs is None or len(prs) < max_prs):
+            while True and (max_prs is None or len(pr_numbers) < max_prs):
                 with record("github.prs"):
                     data, next_url, _ = await self._cached_get_json_async(client, url)
-                prs.extend(data)
-                if not next_url or (max_prs is not None and len(prs) >= max_prs):
+                pr_numbers.extend(pr.get("number") for pr in data)
+                if not next_url or (max_prs is not None and len(pr_numbers) >= max_prs):
                     break
                 url = next_url
-            for pr in prs[: (max_prs or len(prs))]:
-                num = pr.get("number")
-                if not num:
-                    continue
-                reviews_url = f"https://api.github.com/repos/{owner}/{name}/pulls/{num}/reviews?per_page=100"
-                url = reviews_url
-                while True:
-                    with record("github.reviews"):
-                        data, next_url, _ = await self._cached_get_json_async(client, url)
-                    for rv in data:
-                        user_dict = cast(dict[str, Any], rv.get("user") or {})
-                        user = cast(str, user_dict.get("login") or "unknown")
-                        events.append(
-                            ContributionEvent(
-                                id=str(rv.get("id")),
-                                kind=EventKind.review,
-                                repo_id=f"github.com/{owner}/{name}",
-                                user_id=str(user),
-                                created_at=self._parse_dt(
-                                    rv.get("submitted_at") or rv.get("created_at")
-                                ),
-                                lines_added=0,
-                                lines_removed=0,
+            # review pages of different PRs are independent; fetch up to 10 PRs at a time
+            sem = asyncio.Semaphore(10)
+
+            async def one(num: Any) -> list[ContributionEvent]:
+                pr_events: list[ContributionEvent] = []
+                url = f"https://api.github.com/repos/{owner}/{name}/pulls/{num}/reviews?per_page=100"
+                async with sem:
+                    while True:
+                        with record("github.reviews"):
+                            data, next_url, _ = await self._cached_get_json_async(client, url)
+                        for rv in data:
+                            user_dict = cast(dict[str, Any], rv.get("user") or {})
+                            user = cast(str, user_dict.get("login") or "unknown")
+                            if exclude_bots and is_bot_login(user):
+                                continue
+                            pr_events.append(
+                                ContributionEvent.model_construct(
+                                    id=str(rv.get("id")),
+                                    kind=_KIND_REVIEW,
+                                    repo_id=repo_id,
+                                    user_id=sys.intern(str(user)),
+                                    created_at=self._parse_dt(
+                                        rv.get("submitted_at") or rv.get("created_at")
+                                    ),
+                                    lines_added=0,
+                                    lines_removed=0,
+                                )
                             )
-                        )
-                    if not next_url:
-                        break
-                    url = next_url
-        return events
+                        if not next_url:
+                            break
+                        url = next_url
+                return pr_events
+
+            nums = [n for n in pr_numbers[: (max_prs or len(pr_numbers))] if n]
+            per_pr = await asyncio.gather(*(one(n) for n in nums))
+        return list(chain.from_iterable(per_pr))
 
     async def fetch_user_contributions_graphql_async(
         self, login: str, since: str | None = None
     ) -> list[ContributionEvent]:
-        url = "https://api.github.com/graphql"
-        headers = self._auth_headers()
-        # Cursor-paginated search for PRs and Issues authored by login
-        query = (
-            "query($q:String!, $after:String){"
-            "  search(type: ISSUE, query: $q, first: 100, after: $after){"
-            "    pageInfo{ hasNextPage endCursor }"
-            "    nodes {"
-            "      ... on PullRequest { id number repository { nameWithOwner } author { login } "
-            "createdAt }"
-            "      ... on Issue { id number repository { nameWithOwner } author { login } "
-            "createdAt }"
-            "    }"
-            "  }"
-            "}"
-        )
+        query = _SEARCH_QUERY
         q_base = f"author:{login} is:public"
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
+        parse_dt = self._parse_dt
         events: list[ContributionEvent] = []
-        async with http_async_client() as client:
+
+        def event_of(n: dict[str, Any]) -> ContributionEvent:
+            # one lookup per field; `x and x.get(...)` avoids `or {}` temporaries
+            repo_obj = n.get("repository")
+            author = n.get("author")
+            repo = (repo_obj and repo_obj.get("nameWithOwner")) or "unknown/unknown"
+            return ContributionEvent.model_construct(
+                id=str(n.get("id")),
+                kind=_KIND_PR if n.get("__typename") == "PullRequest" else _KIND_ISSUE,
+                repo_id=sys.intern(f"github.com/{repo}"),
+                user_id=sys.intern(str((author and author.get("login")) or login)),
+                created_at=parse_dt(n.get("createdAt")),
+                lines_added=0,
+                lines_removed=0,
+            )
+
+        async with self._aclient() as client:
             after: str | None = None
             while True:
                 payload: dict[str, Any] = {
                     "query": query,
                     "variables": {"q": q_base, "after": after},
                 }
-                resp = await client.post(url, headers=headers, json=payload)
-                resp.raise_for_status()
-                data = cast(dict[str, Any], resp.json().get("data") or {})
+                data = await self._post_graphql(client, payload)
                 search = cast(dict[str, Any], data.get("search") or {})
-                nodes = cast(list[Any], search.get("nodes") or [])
-                for n_any in nodes:
-                    n = cast(dict[str, Any], n_any)
-                    repo_dict = cast(dict[str, Any], (n.get("repository") or {}))
-                    repo = repo_dict.get("nameWithOwner") or "unknown/unknown"
-                    kind = EventKind.pr if "PullRequest" in str(n) else EventKind.issue
-                    author_dict = cast(dict[str, Any], (n.get("author") or {}))
-                    login_val = author_dict.get("login") or login
-                    events.append(
-                        ContributionEvent(
-                            id=str(n.get("id")),
-                            kind=kind,
-                            repo_id=f"github.com/{repo}",
-                            user_id=str(login_val),
-                            created_at=self._parse_dt(n.get("createdAt")),
-                            lines_added=0,
-                            lines_removed=0,
-                        )
-                    )
+                nodes = cast(list[dict[str, Any]], search.get("nodes") or [])
+                batch = [event_of(n) for n in nodes]
+                if exclude_bots:
+                    batch = [e for e in batch if not is_bot_login(e.user_id)]
+                events.extend(batch)
                 page = cast(dict[str, Any], search.get("pageInfo") or {})
                 if not cast(bool, page.get("hasNextPage")):
                     break
                 after = cast(str | None, page.get("endCursor"))
         return events
 
+    async def fetch_user_contributions_collection_async(
+        self,
+        login: str,
+        since: str | None = None,
+        kinds: Iterable[EventKind] | None = None,
+    ) -> list[ContributionEvent]:
+        """Fetch a user's PRs, issues, reviews and commits via `contributionsCollection`.
+
+        The collection spans at most a year, so the range from `since` (default: the
+        account's creation) to now is split into one-year windows fetched concurrently.
+        Commits are read from the default-branch history of each repository the user
+        committed to (at most 100 per window), filtered to the user, so they carry real
+        SHAs as in the REST crawl. Events carry GitHub's canonical login. `kinds` limits
+        the query to those event kinds (default: all four).
+        """
+        # (connection, node field, kind, timestamp field, include/cursor variable prefix)
+        connections: list[tuple[str, str, EventKind, str, str]] = [
+            ("pullRequestContributions", "pullRequest", EventKind.pr, "createdAt", "pr"),
+            ("issueContributions", "issue", EventKind.issue, "createdAt", "issue"),
+            (
+                "pullRequestReviewContributions",
+                "pullRequestReview",
+                EventKind.review,
+                "submittedAt",
+                "review",
+            ),
+        ]
+        wanted = set(kinds) if kinds is not None else set(EventKind)
+        try:
+            conc = int(os.getenv("OSSMK_CONCURRENCY", "5"))
+        except Exception:
+            conc = 5
+        semaphore = asyncio.Semaphore(max(1, min(conc, 20)))
+
+        async with self._shared_aclient() as client:
+            data = await self._post_graphql(
+                client, {"query": _USER_PROFILE_QUERY, "variables": {"login": login}}
+            )
+            user_obj = cast(dict[str, Any], data.get("user") or {})
+            if not user_obj:
+                return []
+            user_id = sys.intern(str(user_obj.get("login") or login))
+            iso_since = parse_since(since)
+            now = datetime.now(UTC)
+            start = self._parse_dt(iso_since or user_obj.get("createdAt"))
+            windows: list[tuple[datetime, datetime]] = []
+            while start < now:
+                end = min(start + CONTRIBUTIONS_WINDOW, now)
+                windows.append((start, end))
+                start = end
+
+            async def window(
+                lo: datetime, hi: datetime
+            ) -> tuple[list[ContributionEvent], list[str]]:
+                variables: dict[str, Any] = {
+                    "login": login,
+                    "from": lo.isoformat(),
+                    "to": hi.isoformat(),
+                    "commits": EventKind.commit in wanted,
+                    "pr": EventKind.pr in wanted,
+                    "issue": EventKind.issue in wanted,
+                    "review": EventKind.review in wanted,
+                }
+                events: list[ContributionEvent] = []
+                repos: list[str] = []
+                while True:
+                    async with semaphore:
+                        data = await self._post_graphql(
+                            client, {"query": _CONTRIBUTIONS_QUERY, "variables": variables}
+                        )
+                    user = cast(dict[str, Any], data.get("user") or {})
+                    coll = cast(dict[str, Any], user.get("contributionsCollection") or {})
+                    if variables["commits"]:
+                        by_repo = cast(
+                            list[dict[str, Any]], coll.get("commitContributionsByRepository") or []
+                        )
+                        for entry in by_repo:
+                            repo_obj = cast(dict[str, Any], entry.get("repository") or {})
+                            if repo_obj.get("nameWithOwner"):
+                                repos.append(str(repo_obj["nameWithOwner"]))
+                        variables["commits"] = False
+                    for conn_name, field, kind, ts_field, flag in connections:
+                        if not variables[flag]:
+                            continue
+                        conn = cast(dict[str, Any], coll.get(conn_name) or {})
+                        for n_any in cast(list[Any], conn.get("nodes") or []):
+                            n = cast(dict[str, Any], n_any)
+                            item = cast(dict[str, Any], n.get(field) or {})
+                            repo_obj = cast(
+                                dict[str, Any],
+                                (item.get("repository") or n.get("repository") or {}),
+                            )
+                            repo = str(repo_obj.get("nameWithOwner") or "unknown/unknown")
+                            events.append(
+                                ContributionEvent.model_construct(
+                                    id=str(item.get("id")),
+                                    kind=kind,
+                                    repo_id=sys.intern(f"github.com/{repo}"),
+                                    user_id=user_id,
+                                    created_at=self._parse_dt(item.get(ts_field)),
+                                    lines_added=0,
+                                    lines_removed=0,
+                                )
+                            )
+                        page = cast(dict[str, Any], conn.get("pageInfo") or {})
+                        has_next = cast(bool, page.get("hasNextPage"))
+                        variables[flag] = has_next
+                        variables[f"{flag}After"] = page.get("endCursor") if has_next else None
+                    if not (variables["pr"] or variables["issue"] or variables["review"]):
+                        return events, repos
+
+            async def repo_commits(repo: str) -> list[ContributionEvent]:
+                owner, name, repo_id = _repo_ref(repo)
+                variables: dict[str, Any] = {
+                    "owner": owner,
+                    "name": name,
+                    "author": user_obj.get("id"),
+                    "since": windows[0][0].isoformat(),
+                    "until": now.isoformat(),
+                    "after": None,
+                }
+                commits: list[ContributionEvent] = []
+                while True:
+                    async with semaphore:
+                        data = await self._post_graphql(
+                            client, {"query": _USER_COMMITS_QUERY, "variables": variables}
+                        )
+                    repo_obj = cast(dict[str, Any], data.get("repository") or {})
+                    branch = cast(dict[str, Any], repo_obj.get("defaultBranchRef") or {})
+                    target = cast(dict[str, Any], branch.get("target") or {})
+                    history = cast(dict[str, Any], target.get("history") or {})
+                    for n in cast(list[dict[str, Any]], history.get("nodes") or []):
+                        commits.append(
+                            ContributionEvent.model_construct(
+                                id=str(n.get("oid")),
+                                kind=_KIND_COMMIT,
+                                repo_id=repo_id,
+                                user_id=user_id,
+                                created_at=self._parse_dt(n.get("committedDate")),
+                                lines_added=0,
+                                lines_removed=0,
+                            )
+                        )
+                    page = cast(dict[str, Any], history.get("pageInfo") or {})
+                    if not page.get("hasNextPage"):
+                        return commits
+                    variables["after"] = page.get("endCursor")
+
+            per_window = await asyncio.gather(*(window(lo, hi) for lo, hi in windows))
+            # joined once, in window order
+            events = list(chain.from_iterable(evs for evs, _ in per_window))
+            repos = list(dict.fromkeys(chain.from_iterable(r for _, r in per_window)))
+            if repos and user_obj.get("id"):
+                per_repo = await asyncio.gather(*(repo_commits(r) for r in repos))
+                events.extend(chain.from_iterable(per_repo))
+        return events
+
+    async def _repo_first_pages_graphql_async(
+        self, repos: list[str], since: str | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """First RepoPage of each repo, GRAPHQL_REPO_BATCH repositories per aliased query.
+
+        Repos missing from the result (failed batch, null repository) are crawled from
+        page one by `_fetch_repo_all_graphql_async` as before.
+        """
+        iso_since = parse_since(since)
+
+        async def batch_pages(batch: list[str]) -> dict[str, dict[str, Any]]:
+            variables: dict[str, Any] = {
+                "since": iso_since,
+                "gitSince": iso_since,
+                "issues": True,
+                "prs": True,
+                "reviews": True,
+                "commits": True,
+            }
+            for i, repo in enumerate(batch):
+                variables[f"o{i}"], variables[f"n{i}"], _ = _repo_ref(repo)
+            payload = {"query": _repo_batch_query(len(batch)), "variables": variables}
+            try:
+                async with self._aclient() as client:
+                    data = await self._post_graphql(client, payload)
+            except Exception:
+                return {}
+            pages = (data.get(f"r{i}") for i in range(len(batch)))
+            return {repo: page for repo, page in zip(batch, pages) if page is not None}
+
+        batches = [
+            repos[i : i + GRAPHQL_REPO_BATCH] for i in range(0, len(repos), GRAPHQL_REPO_BATCH)
+        ]
+        first_pages: dict[str, dict[str, Any]] = {}
+        for pages in await asyncio.gather(*(batch_pages(b) for b in batches)):
+            first_pages.update(pages)
+        return first_pages
+
+    async def _fetch_repo_all_graphql_async(
+        self,
+        repo: str,
+        since: str | None = None,
+        first_page: dict[str, Any] | None = None,
+    ) -> list[ContributionEvent]:
+        """GraphQL counterpart of `fetch_repo_all_async`: one request per page for all kinds.
+
+        Mirrors the REST crawl: every issue and PR (PRs stop once older than `since`),
+        reviews of the 50 most recently updated PRs, and default-branch commits.
+        `first_page` is the repo's first RepoPage when a batched query already fetched it.
+        """
+        owner, name, repo_id = _repo_ref(repo)
+        iso_since = parse_since(since)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
+        variables: dict[str, Any] = {
+            "owner": owner,
+            "name": name,
+            "since": iso_since,
+            "gitSince": iso_since,
+            "issues": True,
+            "prs": True,
+            "reviews": True,
+            "commits": True,
+        }
+        cutoff = self._parse_dt(iso_since) if iso_since else None
+        issues: list[ContributionEvent] = []
+        commits: list[ContributionEvent] = []
+        reviews: list[ContributionEvent] = []
+
+        def login_of(node: dict[str, Any]) -> str:
+            author = cast(dict[str, Any], node.get("author") or {})
+            return sys.intern(str(author.get("login") or "unknown"))
+
+        def advance(conn: dict[str, Any], flag: str) -> None:
+            page = cast(dict[str, Any], conn.get("pageInfo") or {})
+            has_next = bool(variables[flag] and page.get("hasNextPage"))
+            variables[flag] = has_next
+            variables[f"{flag}After"] = page.get("endCursor") if has_next else None
+
+        async with self._aclient() as client:
+            while variables["issues"] or variables["prs"] or variables["commits"]:
+                if first_page is not None:
+                    repo_obj, first_page = first_page, None
+                else:
+                    data = await self._post_graphql(
+                        client, {"query": _REPO_ALL_QUERY, "variables": variables}
+                    )
+                    repo_obj = cast(dict[str, Any], data.get("repository") or {})
+                if variables["issues"]:
+                    conn = cast(dict[str, Any], repo_obj.get("issues") or {})
+                    for n in cast(list[dict[str, Any]], conn.get("nodes") or []):
+                        issues.append(
+                            ContributionEvent.model_construct(
+                                id=str(n.get("id")),
+                                kind=_KIND_ISSUE,
+                                repo_id=repo_id,
+                                user_id=login_of(n),
+                                created_at=self._parse_dt(n.get("createdAt")),
+                                lines_added=0,
+                                lines_removed=0,
+                            )
+                        )
+                    advance(conn, "issues")
+                if variables["prs"]:
+                    conn = cast(dict[str, Any], repo_obj.get("pullRequests") or {})
+                    stale = False
+                    for n in cast(list[dict[str, Any]], conn.get("nodes") or []):
+                        if cutoff is not None and self._parse_dt(n.get("updatedAt")) < cutoff:
+                            # ordered by update time: everything after this is older too
+                            stale = True
+                            break
+                        issues.append(
+                            ContributionEvent.model_construct(
+                                id=str(n.get("id")),
+                                kind=_KIND_PR,
+                                repo_id=repo_id,
+                                user_id=login_of(n),
+                                created_at=self._parse_dt(n.get("createdAt")),
+                                lines_added=0,
+                                lines_removed=0,
+                            )
+                        )
+                        revs = cast(dict[str, Any], n.get("reviews") or {})
+                        for rv in cast(list[dict[str, Any]], revs.get("nodes") or []):
+                            user = login_of(rv)
+                            if exclude_bots and is_bot_login(user):
+                                continue
+                            reviews.append(
+                                ContributionEvent.model_construct(
+                                    id=str(rv.get("id")),
+                                    kind=_KIND_REVIEW,
+                                    repo_id=repo_id,
+                                    user_id=user,
+                                    created_at=self._parse_dt(rv.get("submittedAt")),
+                                    lines_added=0,
+                                    lines_removed=0,
+                                )
+                            )
+                    advance({} if stale else conn, "prs")
+                    variables["reviews"] = False
+                if variables["commits"]:
+                    branch = cast(dict[str, Any], repo_obj.get("defaultBranchRef") or {})
+                    target = cast(dict[str, Any], branch.get("target") or {})
+                    conn = cast(dict[str, Any], target.get("history") or {})
+                    for n in cast(list[dict[str, Any]], conn.get("nodes") or []):
+                        author = cast(dict[str, Any], n.get("author") or {})
+                        au = cast(dict[str, Any], author.get("user") or {})
+                        user = sys.intern(str(au.get("login") or "unknown"))
+                        if exclude_bots and is_bot_login(user):
+                            continue
+                        commits.append(
+                            ContributionEvent.model_construct(
+                                id=str(n.get("oid")),
+                                kind=_KIND_COMMIT,
+                                repo_id=repo_id,
+                                user_id=user,
+                                created_at=self._parse_dt(n.get("committedDate")),
+                                lines_added=0,
+                                lines_removed=0,
+                            )
+                        )
+                    advance(conn, "commits")
+        return issues + commits + reviews
+
     async def fetch_repo_commits_graphql_async(
         self, repo: str, since: str | None = None
     ) -> list[ContributionEvent]:
         """Fetch commits via GraphQL commit history on default branch."""
-        owner, name = repo.split("/", 1)
-        url = "https://api.github.com/graphql"
-        headers = self._auth_headers()
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
         query = (
-            "query($owner:String!, $name:String!, $since:GitTimestamp){"
+            "query($owner:String!, $name:String!, $since:GitTimestamp, $after:String){"
             "  repository(owner:$owner, name:$name){"
             "    defaultBranchRef {"
             "      target {"
             "        ... on Commit {"
-            "          history(first:100, since:$since){"
+            "          history(first:100, after:$after, since:$since){"
             "            pageInfo{ hasNextPage endCursor }"
             "            nodes{ oid committedDate author{ user{ login } } }"
             "          }"
@@ -420,18 +1203,11 @@ class GitHubProvider:
         )
         params = {"owner": owner, "name": name, "since": parse_since(since)}
         events: list[ContributionEvent] = []
-        async with http_async_client() as client:
+        async with self._aclient() as client:
             after = None
             while True:
-                variables = dict(params)
-                if after:
-                    # GitTimestamp doesn't take cursor; after applies to connection
-                    pass
-                resp = await client.post(
-                    url, headers=headers, json={"query": query, "variables": variables}
-                )
-                resp.raise_for_status()
-                data = cast(dict[str, Any], resp.json().get("data") or {})
+                variables = {**params, "after": after}
+                data = await self._post_graphql(client, {"query": query, "variables": variables})
                 repo_obj = cast(dict[str, Any], data.get("repository") or {})
                 repo_data = cast(dict[str, Any], repo_obj.get("defaultBranchRef") or {})
                 target = cast(dict[str, Any], repo_data.get("target") or {})
@@ -442,14 +1218,14 @@ class GitHubProvider:
                     author_obj = cast(dict[str, Any], n.get("author") or {})
                     au = cast(dict[str, Any], author_obj.get("user") or {})
                     login = str(au.get("login") or "unknown")
-                    if os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1" and is_bot_login(login):
+                    if exclude_bots and is_bot_login(login):
                         continue
                     events.append(
-                        ContributionEvent(
+                        ContributionEvent.model_construct(
                             id=str(n.get("oid")),
-                            kind=EventKind.commit,
-                            repo_id=f"github.com/{owner}/{name}",
-                            user_id=str(login),
+                            kind=_KIND_COMMIT,
+                            repo_id=repo_id,
+                            user_id=sys.intern(str(login)),
                             created_at=self._parse_dt(n.get("committedDate")),
                             lines_added=0,
                             lines_removed=0,
@@ -466,9 +1242,8 @@ class GitHubProvider:
         repo: str,
         max_reviews: int | None = 1000,
     ) -> list[ContributionEvent]:
-        owner, name = repo.split("/", 1)
-        url = "https://api.github.com/graphql"
-        headers = self._auth_headers()
+        owner, name, repo_id = _repo_ref(repo)
+        exclude_bots = os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1"
         query = (
             "query($owner:String!, $name:String!, $after:String){"
             "  repository(owner:$owner, name:$name){"
@@ -482,20 +1257,17 @@ class GitHubProvider:
             "}"
         )
         events: list[ContributionEvent] = []
-        async with http_async_client() as client:
+        async with self._aclient() as client:
             after: str | None = None
             total = 0
             while True and (max_reviews is None or total < max_reviews):
-                resp = await client.post(
-                    url,
-                    headers=headers,
-                    json={
+                data = await self._post_graphql(
+                    client,
+                    {
                         "query": query,
                         "variables": {"owner": owner, "name": name, "after": after},
                     },
                 )
-                resp.raise_for_status()
-                data = cast(dict[str, Any], resp.json().get("data") or {})
                 repo_obj = cast(dict[str, Any], data.get("repository") or {})
                 prs = cast(dict[str, Any], repo_obj.get("pullRequests") or {})
                 nodes = cast(list[Any], prs.get("nodes") or [])
@@ -506,14 +1278,14 @@ class GitHubProvider:
                         rv = cast(dict[str, Any], rv)
                         author_obj = cast(dict[str, Any], (rv.get("author") or {}))
                         user = cast(str, author_obj.get("login") or "unknown")
-                        if os.getenv("OSSMK_EXCLUDE_BOTS", "1") == "1" and is_bot_login(user):
+                        if exclude_bots and is_bot_login(user):
                             continue
                         events.append(
-                            ContributionEvent(
+                            ContributionEvent.model_construct(
                                 id=str(rv.get("id")),
-                                kind=EventKind.review,
-                                repo_id=f"github.com/{owner}/{name}",
-                                user_id=str(user),
+                                kind=_KIND_REVIEW,
+                                repo_id=repo_id,
+                                user_id=sys.intern(str(user)),
                                 created_at=self._parse_dt(rv.get("submittedAt")),
                                 lines_added=0,
                                 lines_removed=0,
@@ -535,30 +1307,36 @@ class GitHubProvider:
     async def fetch_user_contributions_graphql_full_async(
         self, login: str, since: str | None = None, max_repos: int | None = 20
     ) -> list[ContributionEvent]:
-        """GraphQL-first collection: PR/Issue by search + per-repo commit history."""
-        # PR/Issue authored by user (search)
-        pr_issue = await self.fetch_user_contributions_graphql_async(login, since=since)
-        # Per-repo commit history for user's own repos
-        repos = self.fetch_user_repos(login)
-        if max_repos is not None:
-            repos = repos[:max_repos]
+        """GraphQL-first collection: PR/Issue by search + per-repo commit history and reviews.
+
+        Commits and reviews (by any author) cover the user's first `max_repos` own
+        repositories; every repo's two queries run concurrently on one shared client.
+        """
         try:
             conc = int(os.getenv("OSSMK_CONCURRENCY", "5"))
         except Exception:
             conc = 5
         sem = asyncio.Semaphore(max(1, min(conc, 20)))
-        commits: list[ContributionEvent] = []
-        reviews: list[ContributionEvent] = []
 
-        async def run(repo: str) -> None:
+        async def run(repo: str) -> tuple[list[ContributionEvent], list[ContributionEvent]]:
             async with sem:
-                try:
-                    c = await self.fetch_repo_commits_graphql_async(repo, since=since)
-                    r = await self.fetch_repo_reviews_graphql_async(repo)
-                    commits.extend(c)
-                    reviews.extend(r)
-                except Exception:
-                    return
+                c, r = await asyncio.gather(
+                    self.fetch_repo_commits_graphql_async(repo, since=since),
+                    self.fetch_repo_reviews_graphql_async(repo),
+                    return_exceptions=True,
+                )
+            if isinstance(c, BaseException) or isinstance(r, BaseException):
+                return [], []
+            return c, r
 
-        await asyncio.gather(*(run(r) for r in repos))
+        async with self._shared_aclient():
+            repos = await self._fetch_user_repos_async(login)
+            if max_repos is not None:
+                repos = repos[:max_repos]
+            pr_issue, per_repo = await asyncio.gather(
+                self.fetch_user_contributions_graphql_async(login, since=since),
+                asyncio.gather(*(run(r) for r in repos)),
+            )
+        commits = list(chain.from_iterable(c for c, _ in per_repo))
+        reviews = list(chain.from_iterable(r for _, r in per_repo))
         return pr_issue + commits + reviews
@@ -50,6 +50,10 @@ def ensure_schema(conn: Any) -> None:
         )
 
 
+# Above this many rows, stream through COPY instead of one INSERT per row.
+COPY_THRESHOLD = 500
+
+
 def save_events(conn: Any, events: Iterable[ContributionEvent]) -> int:
     rows = [
         (
@@ -66,6 +70,9 @@ def save_events(conn: Any, events: Iterable[ContributionEvent]) -> int:
     ]
     if not rows:
         return 0
+    if len(rows) >= COPY_THRESHOLD:
+        _copy_insert_events(conn, rows)
+        return len(rows)
     with conn.cursor() as cur:
         cur.executemany(
             """
@@ -87,6 +94,53 @@ def save_events(conn: Any, events: Iterable[ContributionEvent]) -> int:
     return len(rows)
 
 
+def _copy_insert_events(conn: Any, rows: list[tuple[Any, ...]]) -> None:
+    """COPY rows into a session temp table, then insert the new ones with one statement."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS ossmk_events_stage (
+                ord BIGINT NOT NULL,
+                id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                repo_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL,
+                lines_added INTEGER NOT NULL,
+                lines_removed INTEGER NOT NULL,
+                source_host TEXT NOT NULL
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        cur.execute("TRUNCATE ossmk_events_stage")
+        with cur.copy(
+            "COPY ossmk_events_stage (ord, id, kind, repo_id, user_id, created_at,"
+            " lines_added, lines_removed, source_host) FROM STDIN"
+        ) as copy:
+            for i, row in enumerate(rows):
+                copy.write_row((i, *row))
+        # DISTINCT ON keeps the first occurrence of an id, matching row-by-row DO NOTHING.
+        cur.execute(
+            """
+            INSERT INTO ossmk_events (
+                id,
+                kind,
+                repo_id,
+                user_id,
+                created_at,
+                lines_added,
+                lines_removed,
+                source_host
+            )
+            SELECT DISTINCT ON (id)
+                id, kind, repo_id, user_id, created_at, lines_added, lines_removed, source_host
+            FROM ossmk_events_stage
+            ORDER BY id, ord
+            ON CONFLICT (id) DO NOTHING
+            """
+        )
+
+
 def save_scores(conn: Any, scores: list[dict[str, object]]) -> int:
     rows = [
         (
@@ -99,6 +153,9 @@ def save_scores(conn: Any, scores: list[dict[str, object]]) -> int:
     ]
     if not rows:
         return 0
+    if len(rows) >= COPY_THRESHOLD:
+        _copy_upsert_scores(conn, rows)
+        return len(rows)
     with conn.cursor() as cur:
         cur.executemany(
             """
@@ -113,6 +170,41 @@ def save_scores(conn: Any, scores: list[dict[str, object]]) -> int:
     return len(rows)
 
 
+def _copy_upsert_scores(conn: Any, rows: list[tuple[str, str, float, str]]) -> None:
+    """COPY rows into a session temp table, then upsert them with a single statement."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS ossmk_scores_stage (
+                ord BIGINT NOT NULL,
+                user_id TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                value DOUBLE PRECISION NOT NULL,
+                window TEXT NOT NULL
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        cur.execute("TRUNCATE ossmk_scores_stage")
+        with cur.copy(
+            "COPY ossmk_scores_stage (ord, user_id, dimension, value, window) FROM STDIN"
+        ) as copy:
+            for i, row in enumerate(rows):
+                copy.write_row((i, *row))
+        # DISTINCT ON keeps the last occurrence of a key, matching row-by-row upserts.
+        cur.execute(
+            """
+            INSERT INTO ossmk_scores (user_id, dimension, value, window, generated_at)
+            SELECT DISTINCT ON (user_id, dimension, window)
+                user_id, dimension, value, window, now()
+            FROM ossmk_scores_stage
+            ORDER BY user_id, dimension, window, ord DESC
+            ON CONFLICT (user_id, dimension, window) DO UPDATE SET
+              value = EXCLUDED.value,
+              generated_at = now()
+            """
+        )
+
+
 class PostgresBackend(StorageBackend):
     def __init__(self, dsn: str) -> None:
         self._dsn = dsn
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import os
 import sqlite3
+import threading
+import weakref
+import zlib
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -22,58 +27,168 @@ def _default_cache_path() -> Path:
     return path
 
 
-@dataclass
+# Marks zlib-compressed cache bodies; rows written before compression are read as-is.
+_ZLIB_PREFIX = b"ossmk-zlib:"
+# Cache writes are buffered and committed together once this many are pending;
+# the rest are committed by flush()/close() at the end of a crawl or at exit.
+CACHE_WRITE_BATCH = 50
+
+# Bound parameters per `IN (...)` lookup; stays under SQLite's default variable limit.
+CACHE_READ_CHUNK = 500
+
+_CacheRow = tuple[str | None, str | None, bytes, str]
+
+
+def _row_to_entry(row: Any) -> dict[str, Any]:
+    etag, last_modified, body, fetched_at = row
+    if isinstance(body, bytes) and body.startswith(_ZLIB_PREFIX):
+        body = zlib.decompress(body[len(_ZLIB_PREFIX) :])
+    return {
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body,
+        "fetched_at": fetched_at,
+    }
+
+
+@dataclass(eq=False)
 class HttpCache:
     path: Path = _default_cache_path()
+    _conn: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _pending: dict[str, _CacheRow] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        _OPEN_CACHES.add(self)
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS http_cache (
-                url TEXT PRIMARY KEY,
-                etag TEXT,
-                last_modified TEXT,
-                body TEXT,
-                fetched_at TEXT
+        # One connection per cache, shared across threads under self._lock.
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL + NORMAL: commits no longer fsync the main database file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT,
+                    fetched_at TEXT
+                )
+                """
             )
-            """
-        )
-        return conn
+            conn.commit()
+            self._conn = conn
+        return self._conn
 
     def get(self, url: str) -> dict[str, Any] | None:
-        with self._connect() as conn:
-            cur = conn.execute(
-                "SELECT etag, last_modified, body, fetched_at FROM http_cache WHERE url=?",
-                (url,),
-            )
-            row = cur.fetchone()
-            if not row:
-                return None
-            etag, last_modified, body, fetched_at = row
-            return {
-                "etag": etag,
-                "last_modified": last_modified,
-                "body": body,
-                "fetched_at": fetched_at,
-            }
+        with self._lock:
+            row: Any = self._pending.get(url)
+            if row is None:
+                cur = self._connect().execute(
+                    "SELECT etag, last_modified, body, fetched_at FROM http_cache WHERE url=?",
+                    (url,),
+                )
+                row = cur.fetchone()
+        return _row_to_entry(row) if row else None
+
+    def get_many(self, urls: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Look up several URLs with one query per CACHE_READ_CHUNK; misses are omitted."""
+        rows: dict[str, Any] = {}
+        missing: list[str] = []
+        with self._lock:
+            for u in dict.fromkeys(urls):
+                row = self._pending.get(u)
+                if row is None:
+                    missing.append(u)
+                else:
+                    rows[u] = row
+            for i in range(0, len(missing), CACHE_READ_CHUNK):
+                chunk = missing[i : i + CACHE_READ_CHUNK]
+                cur = self._connect().execute(
+                    "SELECT url, etag, last_modified, body, fetched_at FROM http_cache "
+                    f"WHERE url IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                rows.update((r[0], r[1:]) for r in cur.fetchall())
+        return {u: _row_to_entry(r) for u, r in rows.items()}
 
     def set(
         self,
         url: str,
         etag: str | None,
         last_modified: str | None,
-        body: str,
+        body: str | bytes,
+        fetched_at: str,
+    ) -> None:
+        # GitHub JSON repeats field names on every item and compresses several-fold
+        raw = body.encode("utf-8") if isinstance(body, str) else body
+        packed = _ZLIB_PREFIX + zlib.compress(raw, 6)
+        with self._lock:
+            self._pending[url] = (etag, last_modified, packed, fetched_at)
+            if len(self._pending) >= CACHE_WRITE_BATCH:
+                self._flush_locked()
+
+    # Async variants run on the default executor so SQLite I/O and zlib work
+    # (which releases the GIL) stay off the event loop.
+    async def aget(self, url: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.get, url)
+
+    async def aget_many(self, urls: Iterable[str]) -> dict[str, dict[str, Any]]:
+        return await asyncio.to_thread(self.get_many, list(urls))
+
+    async def aset(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        body: str | bytes,
         fetched_at: str,
     ) -> None:
+        await asyncio.to_thread(self.set, url, etag, last_modified, body, fetched_at)
+
+    def flush(self) -> None:
+        """Commit buffered writes (also run at interpreter exit)."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Commit buffered writes and close the connection; it reopens on next use."""
+        with self._lock:
+            self._flush_locked()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows = [(url, *row) for url, row in self._pending.items()]
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 (
                     "REPLACE INTO http_cache(url, etag, last_modified, body, fetched_at) "
                     "VALUES (?, ?, ?, ?, ?)"
                 ),
-                (url, etag, last_modified, body, fetched_at),
+                rows,
             )
+        self._pending.clear()
+
+
+# Live caches, held weakly so registration does not keep them alive; one exit hook
+# flushes whatever is still buffered.
+_OPEN_CACHES: weakref.WeakSet[HttpCache] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    for cache in list(_OPEN_CACHES):
+        try:
+            cache.flush()
+        except sqlite3.Error:
+            pass
 
 
 class SQLiteStorage(StorageBackend):
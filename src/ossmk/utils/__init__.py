@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import os
+import re
+import sys
+import time
+from collections.abc import Coroutine
 from datetime import UTC, datetime, timedelta
-from typing import Any, cast
+from typing import Any, TypeVar, cast
 
 import httpx
 import structlog
 from dateutil import parser as dateutil_parser
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+T = TypeVar("T")
+
 
 def get_logger() -> structlog.stdlib.BoundLogger:
     structlog.configure(
@@ -106,8 +113,34 @@ def http_client() -> httpx.Client:
     return httpx.Client(timeout=30.0, headers={"User-Agent": "ossmk/0.0.1"})
 
 
+# HTTP/2 needs the optional `h2` package (extra: http2); without it stay on HTTP/1.1.
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+# Idle connections outlive the gaps between crawl phases (repo list -> per-repo fan-out).
+ASYNC_CLIENT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+
 def http_async_client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(timeout=30.0, headers={"User-Agent": "ossmk/0.0.1"})
+    # With HTTP/2, concurrent requests to api.github.com multiplex over one connection
+    return httpx.AsyncClient(
+        timeout=30.0,
+        headers={"User-Agent": "ossmk/0.0.1"},
+        http2=_HAS_H2,
+        limits=ASYNC_CLIENT_LIMITS,
+    )
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """`asyncio.run`, on a uvloop event loop when uvloop is installed (extra: fast-loop)."""
+    try:
+        import uvloop  # type: ignore[reportMissingImports]
+
+        loop_factory: Any = cast(Any, uvloop).new_event_loop
+    except Exception:
+        loop_factory = None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(coro)
 
 
 @retry(
@@ -117,24 +150,103 @@ def http_async_client() -> httpx.AsyncClient:
     retry=retry_if_exception_type(httpx.HTTPError),
 )
 def http_get(client: httpx.Client, url: str, headers: dict[str, str]) -> httpx.Response:
-    return client.get(url, headers=headers)
+    resp = client.get(url, headers=headers)
+    wait_s = _capped_rate_limit_wait(resp)
+    if wait_s is not None:
+        time.sleep(wait_s)
+        resp = client.get(url, headers=headers)
+    return resp
 
 
 async def http_get_async(
     client: httpx.AsyncClient, url: str, headers: dict[str, str]
 ) -> httpx.Response:
     resp = await client.get(url, headers=headers)
-    # Handle secondary rate limiting (403) and 429
-    if resp.status_code in (429, 403):
-        reset = resp.headers.get("X-RateLimit-Reset")
-        if reset and reset.isdigit():
-            now = int(datetime.now(UTC).timestamp())
-            wait_s = max(0, int(reset) - now) + 1
-            await asyncio.sleep(wait_s)
-            resp = await client.get(url, headers=headers)
+    wait_s = _capped_rate_limit_wait(resp)
+    if wait_s is not None:
+        await asyncio.sleep(wait_s)
+        resp = await client.get(url, headers=headers)
     return resp
 
 
+async def http_post_async(
+    client: httpx.AsyncClient, url: str, headers: dict[str, str], json: Any
+) -> httpx.Response:
+    resp = await client.post(url, headers=headers, json=json)
+    wait_s = _capped_rate_limit_wait(resp)
+    if wait_s is not None:
+        await asyncio.sleep(wait_s)
+        resp = await client.post(url, headers=headers, json=json)
+    return resp
+
+
+# Longest rate-limit pause honoured before giving up; override with OSSMK_MAX_RATE_LIMIT_WAIT.
+MAX_RATE_LIMIT_WAIT_SECONDS = 60.0
+
+# Rate-limit notices go to stderr so they never mix with JSON written to stdout.
+_rate_limit_log = structlog.wrap_logger(
+    structlog.PrintLogger(sys.stderr),
+    processors=[
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.JSONRenderer(),
+    ],
+)
+
+
+class RateLimitExceeded(RuntimeError):
+    """GitHub asked for a longer pause than OSSMK_MAX_RATE_LIMIT_WAIT allows.
+
+    Not an httpx error, so `http_get`'s retry does not wait again; crawls let it
+    propagate instead of skipping the repository.
+    """
+
+    def __init__(self, url: str, wait_s: float, cap_s: float) -> None:
+        super().__init__(
+            f"GitHub rate limit resets in {wait_s:.0f}s, over the {cap_s:.0f}s cap "
+            f"(OSSMK_MAX_RATE_LIMIT_WAIT) for {url}"
+        )
+        self.url = url
+        self.wait_s = wait_s
+        self.cap_s = cap_s
+
+
+def _capped_rate_limit_wait(resp: httpx.Response) -> float | None:
+    """`_rate_limit_wait`, logged; raises RateLimitExceeded past the configured cap."""
+    wait_s = _rate_limit_wait(resp)
+    if wait_s is None:
+        return None
+    try:
+        cap = float(os.getenv("OSSMK_MAX_RATE_LIMIT_WAIT", MAX_RATE_LIMIT_WAIT_SECONDS))
+    except ValueError:
+        cap = MAX_RATE_LIMIT_WAIT_SECONDS
+    url = str(resp.request.url)
+    if wait_s > cap:
+        _rate_limit_log.warning("rate_limit_wait_exceeds_cap", url=url, wait_s=wait_s, cap_s=cap)
+        raise RateLimitExceeded(url, wait_s, cap)
+    _rate_limit_log.info("rate_limit_wait", url=url, wait_s=wait_s)
+    return wait_s
+
+
+def _rate_limit_wait(resp: httpx.Response) -> float | None:
+    """Seconds to wait before retrying a rate-limited response, or None if it wasn't one.
+
+    Secondary limits send `Retry-After`; an exhausted quota sends `X-RateLimit-Remaining: 0`
+    and the reset epoch. Other 403s (e.g. missing permissions) are not retried.
+    """
+    if resp.status_code not in (429, 403):
+        return None
+    headers = resp.headers
+    retry_after = headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    reset = headers.get("X-RateLimit-Reset")
+    exhausted = resp.status_code == 429 or headers.get("X-RateLimit-Remaining") == "0"
+    if exhausted and reset and reset.isdigit():
+        return max(0.0, int(reset) - time.time()) + 1
+    return None
+
+
 def parse_since(since: str | None, max_days: int | None = 180) -> str | None:
     """Accept ISO-8601 or relative like '30d', '12h'. Return ISO string (UTC).
 
@@ -167,12 +279,20 @@ def parse_since(since: str | None, max_days: int | None = 180) -> str | None:
 
 
 def parse_link_next(link_header: str | None) -> str | None:
+    return _parse_link(link_header, 'rel="next"')
+
+
+def parse_link_last(link_header: str | None) -> str | None:
+    return _parse_link(link_header, 'rel="last"')
+
+
+def _parse_link(link_header: str | None, rel: str) -> str | None:
     if not link_header:
         return None
     # format: <url1>; rel="next", <url2>; rel="last"
     parts = [p.strip() for p in link_header.split(",")]
     for p in parts:
-        if 'rel="next"' in p:
+        if rel in p:
             start = p.find("<")
             end = p.find(">", start + 1)
             if start != -1 and end != -1:
@@ -180,10 +300,11 @@ def parse_link_next(link_header: str | None) -> str | None:
     return None
 
 
+# Compiled once: app accounts ("…[bot]"), "-bot" suffixes and a few well-known bot logins.
+BOT_LOGIN_RE = re.compile(r"\[bot\]|-bot\Z|\A(?:dependabot|github-actions|renovate)\Z", re.I)
+
+
 def is_bot_login(login: str | None) -> bool:
     if not login:
         return False
-    lower_login = login.lower()
-    if lower_login in {"dependabot", "github-actions", "renovate[bot]", "renovate"}:
-        return True
-    return lower_login.endswith("[bot]") or lower_login.endswith("-bot") or "[bot]" in lower_login
+    return BOT_LOGIN_RE.search(login) is not None
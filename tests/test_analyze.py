@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+import ossmk.core.services.analyze as analyze
+from ossmk.core.models import ContributionEvent
+
+
+@pytest.fixture
+def fetches(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[int | None]:
+    """Counts crawls; the events cache lives under tmp_path with a one-hour TTL."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("OSSMK_EVENTS_CACHE_TTL", "3600")
+    monkeypatch.delenv("OSSMK_EXCLUDE_BOTS", raising=False)
+    monkeypatch.delenv("OSSMK_USE_GRAPHQL", raising=False)
+    calls: list[int | None] = []
+
+    async def fake_crawl(
+        login: str, max_repos: int | None = 20, since: str | None = None
+    ) -> list[ContributionEvent]:
+        calls.append(max_repos)
+        return [
+            ContributionEvent(
+                id="1",
+                kind="commit",
+                repo_id="o/r",
+                user_id=login,
+                created_at=datetime(2024, 1, 1, tzinfo=UTC),
+            )
+        ]
+
+    monkeypatch.setattr(analyze.github, "fetch_user_contributions_async", fake_crawl)
+    return calls
+
+
+def test_events_cache_reuses_a_relative_since_within_the_day(fetches: list[int | None]) -> None:
+    first = analyze.analyze_github_user("Alice", since="90d")
+    second = analyze.analyze_github_user("alice", since="90d")
+    assert fetches == [20]
+    assert second.events == first.events
+
+
+def test_events_cache_key_covers_crawl_options(
+    fetches: list[int | None], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze.analyze_github_user("alice", since="90d")
+    analyze.analyze_github_user("alice", since="90d", max_repos=5)
+    monkeypatch.setenv("OSSMK_EXCLUDE_BOTS", "0")
+    analyze.analyze_github_user("alice", since="90d", max_repos=5)
+    monkeypatch.setenv("OSSMK_USE_GRAPHQL", "1")
+    analyze.analyze_github_user("alice", since="90d", max_repos=5)
+    assert fetches == [20, 5, 5, 5]
+
+
+def test_expired_events_cache_is_removed_on_read(fetches: list[int | None]) -> None:
+    analyze.analyze_github_user("alice")
+    path = analyze._events_cache_file("alice", None, "auto", 20)
+    assert path is not None and path.exists()
+    stale = time.time() - 7200
+    os.utime(path, (stale, stale))
+    assert analyze._read_cached_events(path) is None
+    assert not path.exists()
+
+
+def test_since_day_is_the_utc_date() -> None:
+    assert analyze._since_day("2024-03-01T23:30:00-05:00") == "2024-03-02"
+    assert analyze._since_day(None) is None
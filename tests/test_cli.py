@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+import ossmk.core.services.analyze as analyze
+import ossmk.exporters.parquet as parquet
+from ossmk.cli import app
+
+EVENTS = [
+    {
+        "id": str(i),
+        "kind": kind,
+        "repo_id": repo,
+        "user_id": user,
+        "created_at": created_at,
+        "lines_added": 3,
+        "lines_removed": 1,
+    }
+    for i, (kind, repo, user, created_at) in enumerate(
+        [
+            ("pr", "github.com/o/r", "alice", "2024-01-01T10:00:00Z"),
+            ("pr", "github.com/o/r", "alice", "2024-01-01T11:00:00+00:00"),
+            ("commit", "github.com/alice/x", "alice", "2024-01-02T00:00:00+00:00"),
+            ("review", "github.com/o/r", "bob", "2024-01-03T00:00:00Z"),
+            ("issue", "github.com/o/r", "carol", "2024-01-03T00:00:00.123456+00:00"),
+        ]
+    )
+] + [
+    # past the default daily cap of 5 PRs per user
+    {
+        "id": f"clip{i}",
+        "kind": "pr",
+        "repo_id": "github.com/o/r",
+        "user_id": "dave",
+        "created_at": "2024-01-04T00:00:00Z",
+    }
+    for i in range(7)
+]
+
+
+def _score(tmp_path: Path, *extra: str) -> list[dict[str, object]]:
+    src = tmp_path / "events.json"
+    src.write_text(json.dumps(EVENTS), encoding="utf-8")
+    out = tmp_path / f"scores{len(extra)}.json"
+    result = CliRunner().invoke(app, ["score", "--input", str(src), "--out", str(out), *extra])
+    assert result.exit_code == 0, result.output
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def test_score_unsafe_fast_matches_validated(tmp_path: Path) -> None:
+    validated = _score(tmp_path)
+    assert validated
+    assert _score(tmp_path, "--unsafe-fast") == validated
+
+
+def _fake_analysis(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake(login: str, **_: Any) -> analyze.AnalysisResult:
+        scores: list[Any] = [
+            {"user_id": login, "dimension": "code", "value": 1.0, "window": "all"}
+        ]
+        return analyze.AnalysisResult(
+            user=login, events_count=1, events=[], scores=scores, summary={"login": login}
+        )
+
+    monkeypatch.setattr(analyze, "analyze_github_user", fake)
+
+
+def test_analyze_user_writes_scores_parquet(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    _fake_analysis(monkeypatch)
+    path = tmp_path / "scores.parquet"
+    result = CliRunner().invoke(app, ["analyze-user", "alice", "--out", f"parquet:{path}"])
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(path).to_pylist()[0]["user_id"] == "alice"
+
+
+def test_analyze_user_parquet_without_pyarrow_is_a_usage_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _fake_analysis(monkeypatch)
+    monkeypatch.setattr(parquet, "pa", None)
+    path = tmp_path / "scores.parquet"
+    result = CliRunner().invoke(app, ["analyze-user", "alice", "--out", f"parquet:{path}"])
+    assert result.exit_code == 2
+    assert not path.exists()
+
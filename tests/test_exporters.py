@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import ossmk.exporters.json as json_exporter
+from ossmk.exporters.json import write_json, write_json_stream
+
+ITEMS: list[Any] = [
+    {"user_id": "alice", "dimension": "code", "value": 1.5, "window": "all"},
+    {"nested": {"list": [1, 2, {"k": None}], "empty": {}}, "text": "naïve ✓"},
+    {"at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)},
+    [],
+    "plain",
+    3,
+]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("items", [ITEMS, ITEMS[:1], []])
+def test_write_json_stream_matches_write_json(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool, items: list[Any]
+) -> None:
+    if use_orjson and json_exporter.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(json_exporter, "orjson", None)
+    whole = tmp_path / "whole.json"
+    streamed = tmp_path / "streamed.json"
+    write_json(items, out=str(whole))
+    write_json_stream(iter(items), out=str(streamed))
+    assert streamed.read_bytes() == whole.read_bytes()
+
+
+def test_write_parquet_chunked_all_null_first_chunk(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    import ossmk.exporters.parquet as parquet
+
+    monkeypatch.setattr(parquet, "PARQUET_CHUNK_ROWS", 4)
+    rows: list[dict[str, Any]] = [{"id": i, "note": None} for i in range(6)]
+    rows += [{"id": 6, "note": "late"}, {"id": 7, "extra": 2.5}]
+    out = tmp_path / "rows.parquet"
+    parquet.write_parquet(rows, str(out))
+    table = pq.read_table(out)
+    assert str(table.schema.field("note").type) == "string"
+    assert table.num_rows == len(rows)
+    keys = sorted({k for r in rows for k in r})
+    assert table.to_pylist() == [{k: r.get(k) for k in keys} for r in rows]
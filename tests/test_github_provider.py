@@ -0,0 +1,580 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+import ossmk.providers.github.client as gh
+from ossmk.storage.sqlite import HttpCache
+from ossmk.utils import RateLimitExceeded
+
+_ISSUES_P2 = "https://api.github.com/repos/o/r/issues?state=all&per_page=100&page=2"
+
+
+def _handler(req: httpx.Request) -> httpx.Response:
+    u = str(req.url)
+    if "/issues" in u:
+        if "page=2" in u:
+            return httpx.Response(
+                200,
+                json=[{"id": 3, "user": {"login": "bob"}, "created_at": "2024-01-03T00:00:00Z"}],
+            )
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": 1,
+                    "user": {"login": "alice"},
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "pull_request": {},
+                },
+                {"id": 2, "user": None, "created_at": "2024-01-02T00:00:00Z"},
+            ],
+            headers={"Link": f'<{_ISSUES_P2}>; rel="next", <{_ISSUES_P2}>; rel="last"'},
+        )
+    if "/commits" in u:
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "sha": "abc",
+                    "author": {"login": "alice"},
+                    "commit": {"author": {"date": "2024-01-05T00:00:00Z"}},
+                },
+                {
+                    "sha": "bot",
+                    "author": {"login": "dependabot[bot]"},
+                    "commit": {"author": {"date": "2024-01-05T00:00:00Z"}},
+                },
+            ],
+        )
+    if "/reviews" in u:
+        n = u.split("/pulls/")[1].split("/")[0]
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": int(n) * 10,
+                    "user": {"login": f"rev{n}"},
+                    "submitted_at": "2024-01-07T00:00:00Z",
+                }
+            ],
+        )
+    if "/pulls" in u:
+        return httpx.Response(200, json=[{"number": 1}, {"number": 2}])
+    if "/users/" in u:
+        return httpx.Response(200, json=[{"full_name": "o/r"}, {"full_name": "o/s"}])
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Any:
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    transport = httpx.MockTransport(_handler)
+    monkeypatch.setattr(gh, "http_client", lambda: httpx.Client(transport=transport))
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    yield p
+    p.close()
+
+
+def _key(events: list[Any]) -> list[tuple[str, str, str, str, str]]:
+    return sorted(
+        (e.id, e.kind.value, e.repo_id, e.user_id, e.created_at.isoformat()) for e in events
+    )
+
+
+def test_sync_user_crawl_matches_async(provider: Any, tmp_path: Path) -> None:
+    sync_events = provider.fetch_user_contributions("u")
+    provider.cache = HttpCache(path=tmp_path / "async.sqlite")
+    async_events = asyncio.run(provider.fetch_user_contributions_async("u"))
+    assert sync_events
+    assert _key(sync_events) == _key(async_events)
+
+
+def test_sync_user_crawl_commits_cache(provider: Any) -> None:
+    provider.fetch_user_contributions("u")
+    # the shared cache is flushed at the end of the crawl, so a fresh reader sees it
+    fresh = HttpCache(path=provider.cache.path)
+    assert fresh.get("https://api.github.com/repos/o/r/commits?per_page=100") is not None
+
+
+def _rate_limited_provider(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, limited: list[str]
+) -> Any:
+    """Provider whose o/s commit listing reports a rate limit resetting in an hour."""
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        if "/repos/o/s/commits" in str(req.url):
+            limited.append(str(req.url))
+            return httpx.Response(403, headers={"Retry-After": "3600"})
+        return _handler(req)
+
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    monkeypatch.setenv("OSSMK_MAX_RATE_LIMIT_WAIT", "5")
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(gh, "http_client", lambda: httpx.Client(transport=transport))
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    return p
+
+
+def test_rate_limit_over_cap_aborts_sync_crawl_and_flushes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    limited: list[str] = []
+    p = _rate_limited_provider(monkeypatch, tmp_path, limited)
+    with pytest.raises(RateLimitExceeded) as exc:
+        p.fetch_user_contributions("u")
+    p.close()
+    assert exc.value.wait_s == 3600 and exc.value.cap_s == 5
+    # raised straight away: neither slept on nor retried by http_get
+    assert len(limited) == 1
+    fresh = HttpCache(path=p.cache.path)
+    assert fresh.get("https://api.github.com/repos/o/r/commits?per_page=100") is not None
+
+
+def test_rate_limit_over_cap_aborts_async_crawl(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    limited: list[str] = []
+    p = _rate_limited_provider(monkeypatch, tmp_path, limited)
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(p.fetch_user_contributions_async("u"))
+    p.close()
+    assert len(limited) == 1
+    fresh = HttpCache(path=p.cache.path)
+    assert fresh.get("https://api.github.com/repos/o/r/commits?per_page=100") is not None
+
+
+def _gated_provider(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, gate: asyncio.Event, calls: list[str]
+) -> Any:
+    async def handler(req: httpx.Request) -> httpx.Response:
+        calls.append(str(req.url))
+        await gate.wait()
+        return httpx.Response(200, json=[{"id": 1}])
+
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    return p
+
+
+def test_single_flight_survives_a_cancelled_waiter(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    url = "https://api.github.com/repos/o/r/issues"
+
+    async def main() -> None:
+        gate = asyncio.Event()
+        calls: list[str] = []
+        p = _gated_provider(monkeypatch, tmp_path, gate, calls)
+        async with p._shared_aclient() as client:
+            a = asyncio.create_task(p._cached_get_json_async(client, url))
+            b = asyncio.create_task(p._cached_get_json_async(client, url))
+            while not calls:
+                await asyncio.sleep(0)
+            a.cancel()
+            gate.set()
+            data, _, _ = await b
+            with pytest.raises(asyncio.CancelledError):
+                await a
+        assert calls == [url]
+        assert data == [{"id": 1}]
+        assert not p._inflight
+
+    asyncio.run(main())
+
+
+def test_orphaned_fetch_is_cancelled_with_its_client(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    url = "https://api.github.com/repos/o/r/issues"
+
+    async def main() -> None:
+        calls: list[str] = []
+        p = _gated_provider(monkeypatch, tmp_path, asyncio.Event(), calls)
+        async with p._shared_aclient() as client:
+            waiter = asyncio.create_task(p._cached_get_json_async(client, url))
+            while not calls:
+                await asyncio.sleep(0)
+            fetch = p._inflight[client][url]
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert not fetch.done()
+        # the shielded fetch lost its last waiter; it must not outlive the client
+        assert fetch.cancelled()
+        assert not p._inflight
+
+    asyncio.run(main())
+
+
+def _repo_page(name: str, v: dict[str, Any]) -> dict[str, Any]:
+    repo: dict[str, Any] = {}
+    if v["issues"]:
+        first = v.get("issuesAfter") is None
+        repo["issues"] = {
+            "pageInfo": {"hasNextPage": first and name == "r1", "endCursor": "i2"},
+            "nodes": [
+                {
+                    "id": f"{name}-I{1 if first else 2}",
+                    "createdAt": "2024-01-01T00:00:00Z",
+                    "author": {"login": "al"},
+                }
+            ],
+        }
+    if v["prs"]:
+        repo["pullRequests"] = {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [
+                {
+                    "id": f"{name}-P1",
+                    "createdAt": "2024-01-01T00:00:00Z",
+                    "updatedAt": "2099-01-01T00:00:00Z",
+                    "author": {"login": "al"},
+                    "reviews": {
+                        "nodes": [
+                            {
+                                "id": f"{name}-R1",
+                                "author": {"login": "rv"},
+                                "submittedAt": "2024-01-02T00:00:00Z",
+                            }
+                        ]
+                    },
+                }
+            ],
+        }
+    if v["commits"]:
+        repo["defaultBranchRef"] = {
+            "target": {
+                "history": {
+                    "pageInfo": {"hasNextPage": False},
+                    "nodes": [
+                        {
+                            "oid": f"{name}-c",
+                            "committedDate": "2024-01-03T00:00:00Z",
+                            "author": {"user": {"login": "al"}},
+                        }
+                    ],
+                }
+            }
+        }
+    return repo
+
+
+def test_graphql_batched_first_pages(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    monkeypatch.setenv("OSSMK_USE_GRAPHQL", "1")
+    n_repos = 12
+    posts: list[Any] = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        if req.method == "GET":
+            return httpx.Response(200, json=[{"full_name": f"o/r{i}"} for i in range(n_repos)])
+        v = json.loads(req.content)["variables"]
+        if "owner" in v:
+            posts.append(v["name"])
+            return httpx.Response(200, json={"data": {"repository": _repo_page(v["name"], v)}})
+        aliases = [i for i in range(n_repos) if f"o{i}" in v]
+        posts.append(len(aliases))
+        data = {
+            # r5 comes back null (e.g. renamed or inaccessible) and is crawled on its own
+            f"r{i}": None if v[f"n{i}"] == "r5" else _repo_page(v[f"n{i}"], v)
+            for i in aliases
+        }
+        return httpx.Response(200, json={"data": data})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    events = asyncio.run(p.fetch_user_contributions_async("u", max_repos=None, since="30d"))
+
+    ids = {e.id for e in events}
+    assert len(events) == len(ids) == 4 * n_repos + 1
+    assert {"r1-I1", "r1-I2", "r5-I1", "r5-P1", "r5-R1", "r5-c"} <= ids
+    batches = sorted((x for x in posts if isinstance(x, int)), reverse=True)
+    assert batches == [gh.GRAPHQL_REPO_BATCH, n_repos - gh.GRAPHQL_REPO_BATCH]
+    # only r1's second issues page and the null r5 need their own query
+    assert sorted(x for x in posts if isinstance(x, str)) == ["r1", "r5"]
+
+
+def _collection_provider(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, created_at: datetime
+) -> tuple[Any, list[dict[str, Any]]]:
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+    windows: list[dict[str, Any]] = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        body = json.loads(req.content)
+        query, v = body["query"], body["variables"]
+        if "createdAt }" in query:
+            user = {"id": "U_1", "login": "Alice", "createdAt": created_at.isoformat()}
+            return httpx.Response(200, json={"data": {"user": user}})
+        if "contributionsCollection" in query:
+            windows.append(v)
+            year = v["from"][:4]
+            coll: dict[str, Any] = {}
+            if v["commits"]:
+                coll["commitContributionsByRepository"] = [
+                    {"repository": {"nameWithOwner": "o/r"}},
+                    {"repository": {"nameWithOwner": f"o/y{year}"}},
+                ]
+            if v["pr"]:
+                second = v.get("prAfter") is not None
+                coll["pullRequestContributions"] = {
+                    "pageInfo": {"hasNextPage": not second, "endCursor": "p2"},
+                    "nodes": [
+                        {
+                            "pullRequest": {
+                                "id": f"PR{year}{int(second)}",
+                                "createdAt": v["from"],
+                                "repository": {"nameWithOwner": "o/r"},
+                            }
+                        }
+                    ],
+                }
+            for conn in ("issueContributions", "pullRequestReviewContributions"):
+                coll[conn] = {"pageInfo": {"hasNextPage": False}, "nodes": []}
+            return httpx.Response(
+                200, json={"data": {"user": {"contributionsCollection": coll}}}
+            )
+        assert v["author"] == "U_1"
+        history = {
+            "pageInfo": {"hasNextPage": v["after"] is None, "endCursor": "c2"},
+            "nodes": [
+                {
+                    "oid": f"{v['name']}-sha{0 if v['after'] is None else 1}",
+                    "committedDate": "2024-01-01T00:00:00Z",
+                }
+            ],
+        }
+        repo = {"defaultBranchRef": {"target": {"history": history}}}
+        return httpx.Response(200, json={"data": {"repository": repo}})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    return p, windows
+
+
+def test_collection_without_since_covers_account_lifetime_in_year_windows(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    created_at = datetime.now(UTC) - timedelta(days=365 * 2 + 100)
+    p, windows = _collection_provider(monkeypatch, tmp_path, created_at)
+    events = asyncio.run(p.fetch_user_contributions_collection_async("alice"))
+
+    spans = sorted({(v["from"], v["to"]) for v in windows})
+    assert len(spans) == 3
+    assert datetime.fromisoformat(spans[0][0]) == created_at
+    for (lo, hi), (next_lo, _) in zip(spans, spans[1:]):
+        assert hi == next_lo
+    for lo, hi in spans:
+        span = datetime.fromisoformat(hi) - datetime.fromisoformat(lo)
+        assert timedelta(0) < span <= gh.CONTRIBUTIONS_WINDOW
+    assert datetime.now(UTC) - datetime.fromisoformat(spans[-1][1]) < timedelta(minutes=1)
+
+    assert {e.user_id for e in events} == {"Alice"}
+    prs = [e.id for e in events if e.kind.value == "pr"]
+    assert len(prs) == len(set(prs)) == 6  # two pages per window
+    commits = sorted(e.id for e in events if e.kind.value == "commit")
+    # real SHAs, each commit once although o/r shows up in every window
+    repos = ["r"] + [f"y{lo[:4]}" for lo, _ in spans]
+    assert commits == sorted(f"{r}-sha{i}" for r in set(repos) for i in (0, 1))
+
+
+def test_collection_since_starts_the_first_window(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    created_at = datetime(2015, 1, 1, tzinfo=UTC)
+    p, windows = _collection_provider(monkeypatch, tmp_path, created_at)
+    events = asyncio.run(
+        p.fetch_user_contributions_collection_async(
+            "alice", since="30d", kinds=[gh.EventKind.pr]
+        )
+    )
+    assert len({(v["from"], v["to"]) for v in windows}) == 1
+    assert not any(v["commits"] for v in windows)
+    assert [e.kind.value for e in events] == ["pr", "pr"]
+
+
+def test_graphql_full_honours_max_repos(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        if req.method == "GET":
+            return httpx.Response(200, json=[{"full_name": f"u/r{i}"} for i in range(3)])
+        body = json.loads(req.content)
+        query, v = body["query"], body["variables"]
+        if "search(" in query:
+            node = {
+                "__typename": "PullRequest",
+                "id": "PR1",
+                "createdAt": "2024-01-01T00:00:00Z",
+                "repository": {"nameWithOwner": "x/y"},
+                "author": {"login": "u"},
+            }
+            search = {"pageInfo": {"hasNextPage": False}, "nodes": [node]}
+            return httpx.Response(200, json={"data": {"search": search}})
+        if "history(" in query:
+            page = 0 if v["after"] is None else 1
+            history = {
+                "pageInfo": {"hasNextPage": page == 0, "endCursor": "c2"},
+                "nodes": [
+                    {
+                        "oid": f"{v['name']}-c{page}",
+                        "committedDate": "2024-01-02T00:00:00Z",
+                        "author": {"user": {"login": "dev"}},
+                    }
+                ],
+            }
+            repo = {"defaultBranchRef": {"target": {"history": history}}}
+            return httpx.Response(200, json={"data": {"repository": repo}})
+        review = {"id": f"{v['name']}-rv", "author": {"login": "rev"}, "submittedAt": None}
+        prs = {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [{"number": 1, "reviews": {"nodes": [review]}}],
+        }
+        return httpx.Response(200, json={"data": {"repository": {"pullRequests": prs}}})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        gh, "http_async_client", lambda: httpx.AsyncClient(transport=transport)
+    )
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    events = asyncio.run(p.fetch_user_contributions_graphql_full_async("u", max_repos=2))
+    assert [e.id for e in events] == [
+        "PR1",
+        "r0-c0",
+        "r0-c1",
+        "r1-c0",
+        "r1-c1",
+        "r0-rv",
+        "r1-rv",
+    ]
+
+
+def test_304_reuses_decoded_page_within_byte_budget(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("GITHUB_TOKEN", "x")
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        etag = f'"{req.url.path}"'
+        if req.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"path": req.url.path}], headers={"ETag": etag})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(gh, "http_client", lambda: httpx.Client(transport=transport))
+    p = gh.GitHubProvider()
+    p.cache = HttpCache(path=tmp_path / "cache.sqlite")
+    with p._client() as client:
+        first, _, _ = p._cached_get_json(client, "https://api.github.com/a")
+        again, _, resp = p._cached_get_json(client, "https://api.github.com/a")
+    assert resp.status_code == 304
+    assert again is first
+
+    size = len(b'[{"path":"/a"}]')
+    monkeypatch.setattr(gh, "PARSED_CACHE_MAX_BYTES", 2 * size)
+    with p._client() as client:
+        for name in ("b", "c", "d"):
+            p._cached_get_json(client, f"https://api.github.com/{name}")
+        # re-decoded from the SQLite body once evicted
+        after, _, resp = p._cached_get_json(client, "https://api.github.com/a")
+    assert resp.status_code == 304
+    assert after == first and after is not first
+    assert p._parsed_bytes <= 2 * size
+    assert len(p._parsed) == 2
+    p.close()
+
+
+_PAGED = "https://api.github.com/repos/o/r/issues?per_page=100"
+
+
+def _paged_link(last: int) -> dict[str, str]:
+    return {"Link": f'<{_PAGED}&page=2>; rel="next", <{_PAGED}&page={last}>; rel="last"'}
+
+
+def test_pages_async_yields_in_page_order(provider: Any) -> None:
+    last = 9
+
+    async def handler(req: httpx.Request) -> httpx.Response:
+        page = int(req.url.params.get("page", "1"))
+        if page == 1:
+            return httpx.Response(200, json=[{"page": 1}], headers=_paged_link(last))
+        # later pages answer first
+        await asyncio.sleep(0.001 * (last - page))
+        return httpx.Response(200, json=[{"page": page}])
+
+    async def crawl() -> list[int]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [p[0]["page"] async for p in provider._pages_async(client, _PAGED)]
+
+    assert asyncio.run(crawl()) == list(range(1, last + 1))
+
+
+def test_pages_async_follows_next_links_without_last(provider: Any) -> None:
+    def handler(req: httpx.Request) -> httpx.Response:
+        page = int(req.url.params.get("page", "1"))
+        headers = {"Link": f'<{_PAGED}&page={page + 1}>; rel="next"'} if page < 4 else {}
+        return httpx.Response(200, json=[{"page": page}], headers=headers)
+
+    async def crawl() -> list[int]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [p[0]["page"] async for p in provider._pages_async(client, _PAGED)]
+
+    assert asyncio.run(crawl()) == [1, 2, 3, 4]
+
+
+def test_pages_async_close_cancels_queued_pages(provider: Any) -> None:
+    last = 20
+    requested: list[int] = []
+
+    async def crawl() -> None:
+        release = asyncio.Event()
+
+        async def handler(req: httpx.Request) -> httpx.Response:
+            page = int(req.url.params.get("page", "1"))
+            if page == 1:
+                return httpx.Response(200, json=[{"page": 1}], headers=_paged_link(last))
+            requested.append(page)
+            await release.wait()
+            return httpx.Response(200, json=[{"page": page}])
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            pages = provider._pages_async(client, _PAGED)
+            assert (await anext(pages))[0]["page"] == 1
+            await asyncio.sleep(0.01)
+            await pages.aclose()
+            # requests already in flight may finish; queued pages must never start
+            release.set()
+            await asyncio.sleep(0.01)
+        assert not provider._inflight
+
+    asyncio.run(crawl())
+    assert len(requested) == gh.PAGE_CONCURRENCY
+    assert max(requested) <= gh.PAGE_CONCURRENCY + 1
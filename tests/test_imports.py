@@ -1,6 +1,35 @@
+import subprocess
+import sys
+
+import pytest
+
+
 def test_import_package():
     import importlib
 
     assert importlib.import_module("ossmk")
     assert importlib.import_module("ossmk.cli")
 
+
+def test_heavy_exports_load_on_first_access():
+    # a fresh interpreter, so modules imported by other tests do not mask the check
+    code = (
+        "import sys, ossmk.core.services as s, ossmk.exporters as e\n"
+        "print('ossmk.core.services.analyze' in sys.modules, 'pyarrow' in sys.modules)\n"
+        "print(callable(s.analyze_github_users), callable(s.analyze_github_user))\n"
+        "print('ossmk.core.services.analyze' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert out == ["False", "False", "True", "True", "True"]
+
+
+def test_unknown_lazy_attribute_raises():
+    import ossmk.core.services
+    import ossmk.exporters
+
+    with pytest.raises(AttributeError):
+        ossmk.core.services.nope  # noqa: B018
+    with pytest.raises(AttributeError):
+        ossmk.exporters.nope  # noqa: B018
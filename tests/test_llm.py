@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import ossmk.core.rules.llm as llm
+
+EVENTS = [{"kind": "pr"}, {"kind": "commit"}, {"kind": "commit"}]
+RULES_TOML = '[dimensions.code]\nkinds = ["pr", "commit"]\nweight = 1.0\n'
+CFG = llm.LLMConfig(provider="openai", model="m")
+
+
+@pytest.fixture
+def completions(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[str]:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("OSSMK_LLM_CACHE", raising=False)
+    monkeypatch.setattr(llm, "_LLM_CACHE", {})
+    prompts: list[str] = []
+
+    def fake_complete(cfg: llm.LLMConfig, content: str) -> str:
+        prompts.append(content)
+        return RULES_TOML
+
+    monkeypatch.setattr(llm, "_openai_complete", fake_complete)
+    return prompts
+
+
+def test_llm_cache_is_off_by_default(completions: list[str], tmp_path: Path) -> None:
+    assert llm.suggest_rules_from_events(EVENTS, CFG) == RULES_TOML
+    assert llm.suggest_rules_from_events(EVENTS, CFG) == RULES_TOML
+    assert len(completions) == 2
+    assert not (tmp_path / "ossmk" / "llm").exists()
+
+
+def test_llm_cache_reuses_completions_from_memory_and_disk(
+    completions: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("OSSMK_LLM_CACHE", "1")
+    assert llm.suggest_rules_from_events(EVENTS, CFG) == RULES_TOML
+    assert llm.suggest_rules_from_events(EVENTS, CFG) == RULES_TOML
+    # a new process starts with an empty memory layer and reads the disk copy
+    monkeypatch.setattr(llm, "_LLM_CACHE", {})
+    assert llm.suggest_rules_from_events(EVENTS, CFG) == RULES_TOML
+    assert len(completions) == 1
+    # a different model is a different prompt key
+    llm.suggest_rules_from_events(EVENTS, llm.LLMConfig(provider="openai", model="other"))
+    assert len(completions) == 2
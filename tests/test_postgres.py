@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+import ossmk.storage.postgres as pg  # noqa: E402
+from ossmk.core.models import ContributionEvent  # noqa: E402
+
+DSN = os.getenv("OSSMK_PG_DSN") or os.getenv("DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DSN, reason="set OSSMK_PG_DSN to run Postgres tests")
+
+# executemany below the threshold, COPY above it
+PATHS = [10**9, 1]
+
+
+@pytest.fixture
+def conn() -> Iterator[Any]:
+    # everything runs in one transaction that is rolled back, temp tables included
+    with psycopg.connect(DSN) as c:
+        pg.ensure_schema(c)
+        yield c
+        c.rollback()
+
+
+def _prefix() -> str:
+    return f"t{uuid.uuid4().hex[:8]}-"
+
+
+def _scores(prefix: str) -> list[dict[str, object]]:
+    return [
+        {"user_id": f"{prefix}alice", "dimension": "code", "value": 1.0},
+        {"user_id": f"{prefix}bob", "dimension": "code", "value": 2.0, "window": "30d"},
+        {"user_id": f"{prefix}alice", "dimension": "code", "value": 3.0},  # last one wins
+    ]
+
+
+def _stored_scores(conn: Any, prefix: str) -> list[Any]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT replace(user_id, %s, ''), dimension, value, window FROM ossmk_scores"
+            " WHERE user_id LIKE %s ORDER BY user_id, window",
+            (prefix, prefix + "%"),
+        )
+        return cur.fetchall()
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_copy_scores_match_executemany(
+    conn: Any, monkeypatch: pytest.MonkeyPatch, existing: bool
+) -> None:
+    results = []
+    for threshold in PATHS:
+        monkeypatch.setattr(pg, "COPY_THRESHOLD", threshold)
+        prefix = _prefix()
+        if existing:
+            pg.save_scores(conn, _scores(prefix)[1:2])
+        assert pg.save_scores(conn, _scores(prefix)) == 3
+        results.append(_stored_scores(conn, prefix))
+    assert results[0] == results[1]
+    assert results[1] == [("alice", "code", 3.0, "all"), ("bob", "code", 2.0, "30d")]
+
+
+def _events(prefix: str) -> list[ContributionEvent]:
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    rows = [
+        ("a", "pr", "alice", 1),
+        ("b", "commit", "bob", 2),
+        ("a", "issue", "carol", 3),  # duplicate id: the first occurrence wins
+        ("c", "review", "dave", 4),
+    ]
+    return [
+        ContributionEvent(
+            id=f"{prefix}{i}",
+            kind=kind,
+            repo_id="github.com/o/r",
+            user_id=user,
+            created_at=created_at,
+            lines_added=n,
+        )
+        for i, kind, user, n in rows
+    ]
+
+
+def _stored_events(conn: Any, prefix: str) -> list[Any]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT replace(id, %s, ''), kind, user_id, lines_added FROM ossmk_events"
+            " WHERE id LIKE %s ORDER BY id",
+            (prefix, prefix + "%"),
+        )
+        return cur.fetchall()
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_copy_events_match_executemany(
+    conn: Any, monkeypatch: pytest.MonkeyPatch, existing: bool
+) -> None:
+    results = []
+    for threshold in PATHS:
+        monkeypatch.setattr(pg, "COPY_THRESHOLD", threshold)
+        prefix = _prefix()
+        if existing:
+            pg.save_events(conn, _events(prefix)[3:])
+        assert pg.save_events(conn, _events(prefix)) == 4
+        results.append(_stored_events(conn, prefix))
+    assert results[0] == results[1]
+    assert results[1] == [
+        ("a", "pr", "alice", 1),
+        ("b", "commit", "bob", 2),
+        ("c", "review", "dave", 4),
+    ]
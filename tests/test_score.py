@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import ossmk.core.services.score as score
+from ossmk.core.models import ContributionEvent
+from ossmk.core.services.score import RuleSet, load_rules, score_events
+
+DAY = datetime(2024, 1, 1, 12, tzinfo=UTC)
+SCORING_ENV = (
+    "OSSMK_SELF_REPO_PENALTY",
+    "OSSMK_USER_ORGS",
+    "OSSMK_ORG_REPO_PENALTY",
+    "OSSMK_DECAY_HALF_LIFE_DAYS",
+    "OSSMK_DECAY_MODE",
+    "OSSMK_DECAY_WINDOW_DAYS",
+    "OSSMK_RULES_FILE",
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in SCORING_ENV:
+        monkeypatch.delenv(name, raising=False)
+
+
+def _ev(i: object, kind: str, repo: str, user: str, created_at: datetime) -> ContributionEvent:
+    return ContributionEvent(
+        id=str(i), kind=kind, repo_id=repo, user_id=user, created_at=created_at
+    )
+
+
+def _flat(entries: Sequence[Mapping[str, Any]]) -> list[tuple[Any, Any, Any]]:
+    return [(e["user_id"], e["dimension"], pytest.approx(e["value"])) for e in entries]
+
+
+def _aged() -> list[ContributionEvent]:
+    now = datetime.now(UTC)
+    return [
+        _ev(i, kind, "github.com/o/r", user, now - timedelta(days=age))
+        for i, (kind, user, age) in enumerate(
+            [
+                ("pr", "alice", 0.5),
+                ("pr", "alice", 5),
+                ("pr", "alice", 15),
+                ("commit", "bob", 40),
+                ("review", "bob", 100),
+            ]
+        )
+    ]
+
+
+def test_default_rules_weights_and_daily_clip() -> None:
+    events = [_ev(i, "pr", "github.com/o/r", "alice", DAY) for i in range(7)]
+    events += [
+        _ev(10, "commit", "github.com/o/r", "alice", DAY),
+        _ev(11, "review", "github.com/o/r", "bob", DAY),
+        _ev(12, "issue", "github.com/o/r", "alice", DAY),
+        _ev(13, "pr", "github.com/o/r", "alice", DAY + timedelta(days=1)),
+    ]
+    result = score_events(events, load_rules("default"))
+    # 5 PRs (daily cap) + 1 next-day PR + 0.8 commit
+    assert _flat(result) == [
+        ("alice", "code", 6.8),
+        ("alice", "community", 0.3),
+        ("bob", "review", 0.6),
+    ]
+    assert all(e["window"] == "all" for e in result)
+
+
+OWNER_EVENTS = [
+    _ev(1, "pr", "github.com/Alice/x", "alice", DAY),  # self repo, owner case differs
+    _ev(2, "pr", "github.com/Org/y", "alice", DAY),  # org repo
+    _ev(3, "pr", "github.com/alice", "alice", DAY),  # no repo name: no owner
+    _ev(4, "pr", "alice/x", "alice", DAY),  # no host: no owner
+    _ev(5, "pr", "github.com/alice/x/extra", "alice", DAY),  # extra segments: owner alice
+    _ev(6, "commit", "github.com/bob/z", "alice", DAY),
+    _ev(7, "review", "github.com/alice/x", "bob", DAY),
+]
+
+
+def test_owner_penalties_off_by_default() -> None:
+    result = score_events(OWNER_EVENTS, load_rules("default"))
+    assert _flat(result) == [("alice", "code", 5.8), ("bob", "review", 0.6)]
+
+
+def test_owner_penalties(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OSSMK_SELF_REPO_PENALTY", "0.5")
+    monkeypatch.setenv("OSSMK_USER_ORGS", " org , other")
+    monkeypatch.setenv("OSSMK_ORG_REPO_PENALTY", "0.25")
+    result = score_events(OWNER_EVENTS, load_rules("default"))
+    # 0.5 (Alice/x) + 0.25 (Org/y) + 1 + 1 + 0.5 (alice/x/extra) + 0.8 commit
+    assert _flat(result) == [("alice", "code", 4.05), ("bob", "review", 0.6)]
+
+
+def test_env_is_read_per_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    rules = load_rules("default")
+    before = score_events(OWNER_EVENTS[:1], rules)
+    monkeypatch.setenv("OSSMK_SELF_REPO_PENALTY", "0.5")
+    after = score_events(OWNER_EVENTS[:1], rules)
+    assert before[0]["value"] == pytest.approx(1.0)
+    assert after[0]["value"] == pytest.approx(0.5)
+
+
+def test_exponential_decay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OSSMK_DECAY_HALF_LIFE_DAYS", "10")
+    result = score_events(_aged(), load_rules("default"))
+    assert _flat(result) == [
+        ("alice", "code", 2**-0.05 + 2**-0.5 + 2**-1.5),
+        ("bob", "code", 0.8 * 2**-4),
+        ("bob", "review", 0.6 * 2**-10),
+    ]
+
+
+def test_linear_decay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OSSMK_DECAY_HALF_LIFE_DAYS", "10")
+    monkeypatch.setenv("OSSMK_DECAY_MODE", "linear")
+    monkeypatch.setenv("OSSMK_DECAY_WINDOW_DAYS", "20")
+    result = score_events(_aged(), load_rules("default"))
+    assert _flat(result) == [
+        ("alice", "code", 0.975 + 0.75 + 0.25),
+        ("bob", "code", 0.0),
+        ("bob", "review", 0.0),
+    ]
+
+
+def test_window_decay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OSSMK_DECAY_MODE", "window")
+    monkeypatch.setenv("OSSMK_DECAY_WINDOW_DAYS", "20")
+    result = score_events(_aged(), load_rules("default"))
+    assert _flat(result) == [("alice", "code", 3.0)]
+
+
+def test_rules_decay_mode_wins_over_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    base = load_rules("default")
+    rules = RuleSet(
+        dimensions=base.dimensions,
+        fairness=base.fairness,
+        decay_mode="window",
+        decay_window_days=20,
+    )
+    monkeypatch.setenv("OSSMK_DECAY_MODE", "linear")
+    assert _flat(score_events(_aged(), rules)) == [("alice", "code", 3.0)]
+
+
+def _count_parses(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    parsed: list[str] = []
+    parse = score._parse_rules_toml
+
+    def counting(path: str) -> RuleSet:
+        parsed.append(path)
+        return parse(path)
+
+    monkeypatch.setattr(score, "_parse_rules_toml", counting)
+    score._load_rules_file.cache_clear()
+    return parsed
+
+
+def test_load_rules_memo_follows_mtime(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    parsed = _count_parses(monkeypatch)
+    path = tmp_path / "rules.toml"
+    path.write_text('[dimensions.code]\nkinds = ["pr"]\nweight = 2.0\n', encoding="utf-8")
+    first = load_rules(str(path))
+    monkeypatch.chdir(tmp_path)
+    # a relative spelling of the same file hits the same entry
+    assert load_rules("rules.toml") == first
+    assert len(parsed) == 1
+    assert first.by_kind["pr"] == (("code", 2.0),)
+
+    path.write_text('[dimensions.code]\nkinds = ["pr"]\nweight = 3.0\n', encoding="utf-8")
+    stamp = time.time() + 10
+    os.utime(path, (stamp, stamp))
+    assert load_rules(str(path)).by_kind["pr"] == (("code", 3.0),)
+    assert len(parsed) == 2
+
+
+def test_load_rules_memo_follows_rules_file_env(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "private.toml"
+    path.write_text('[dimensions.docs]\nkinds = ["issue"]\nweight = 0.5\n', encoding="utf-8")
+    assert "docs" not in load_rules("auto").dimensions
+    monkeypatch.setenv("OSSMK_RULES_FILE", str(path))
+    assert "docs" in load_rules("auto").dimensions
+
+
+def test_loaded_rules_are_private_copies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _count_parses(monkeypatch)
+    path = tmp_path / "rules.toml"
+    path.write_text('[dimensions.code]\nkinds = ["pr"]\nweight = 2.0\n', encoding="utf-8")
+    mine = load_rules(str(path))
+    mine.dimensions["code"]["kinds"].add("commit")
+    mine.dimensions["code"]["weight"] = 5.0
+    # the index follows in-place edits, and the memoized parse is untouched
+    assert mine.by_kind["commit"] == (("code", 5.0),)
+    assert load_rules(str(path)).by_kind == {"pr": (("code", 2.0),)}
+    assert pickle.loads(pickle.dumps(mine)) == mine
+
+
+def test_day_key_buckets_strings_like_datetimes() -> None:
+    est = timezone(timedelta(hours=-5))
+    late = datetime(2024, 1, 1, 23, 30, tzinfo=est)
+    assert score._day_key(late) == score._day_key(late.isoformat()) == "2024-01-01"
+    assert score._day_key("2024-01-01T23:30:00Z") == score._day_key(DAY) == "2024-01-01"
+    assert score._day_key("not a date") == ""
+    assert score._day_key(None) == ""
+
+
+def test_daily_clip_spans_string_and_datetime_timestamps() -> None:
+    rules = RuleSet(
+        dimensions={"code": {"kinds": {"commit"}, "weight": 1.0}}, fairness={"commit": 1}
+    )
+    events = [
+        _ev(1, "commit", "o/r", "alice", DAY),
+        # unvalidated event with a raw timestamp, as some providers hand them over
+        ContributionEvent.model_construct(
+            id="2",
+            kind="commit",
+            repo_id="o/r",
+            user_id="alice",
+            created_at="2024-01-01T18:00:00+00:00",
+        ),
+    ]
+    assert _flat(score_events(events, rules)) == [("alice", "code", 1.0)]
+
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import ossmk.storage.sqlite as sqlite_storage
+from ossmk.storage.sqlite import HttpCache
+
+
+def test_bodies_are_compressed_and_round_trip(tmp_path: Path) -> None:
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    body = b'[{"login": "alice", "type": "User"}]' * 50
+    cache.set("u", '"e"', "lm", body.decode(), "t")
+    cache.flush()
+    with sqlite3.connect(cache.path) as conn:
+        (stored,) = conn.execute("SELECT body FROM http_cache WHERE url='u'").fetchone()
+    assert len(stored) < len(body)
+    assert HttpCache(path=cache.path).get("u") == {
+        "etag": '"e"',
+        "last_modified": "lm",
+        "body": body,
+        "fetched_at": "t",
+    }
+
+
+def test_rows_written_before_compression_read_as_is(tmp_path: Path) -> None:
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    assert cache.get("u") is None  # creates the table
+    with sqlite3.connect(cache.path) as conn:
+        conn.execute(
+            "INSERT INTO http_cache VALUES (?, ?, ?, ?, ?)", ("u", None, None, "[1]", "t")
+        )
+    entry = cache.get("u")
+    assert entry is not None
+    assert entry["body"] == "[1]"
+
+
+def test_buffered_writes_visible_before_flush(tmp_path: Path) -> None:
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    cache.set("u1", '"e1"', None, b'[{"a": 1}]', "t1")
+    # buffered: readable through this cache, not yet committed for other readers
+    assert cache.get("u1") == {
+        "etag": '"e1"',
+        "last_modified": None,
+        "body": b'[{"a": 1}]',
+        "fetched_at": "t1",
+    }
+    assert HttpCache(path=cache.path).get("u1") is None
+    cache.flush()
+    assert HttpCache(path=cache.path).get("u1") is not None
+
+
+def test_full_batch_and_close_commit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sqlite_storage, "CACHE_WRITE_BATCH", 3)
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    reader = HttpCache(path=cache.path)
+    for i in range(4):
+        cache.set(f"u{i}", None, None, b"[]", "t")
+    # the first three filled a batch and were committed; the fourth is still buffered
+    assert [reader.get(f"u{i}") is not None for i in range(4)] == [True, True, True, False]
+    cache.close()
+    assert reader.get("u3") is not None
+    # a closed cache reopens on next use
+    assert cache.get("u3") is not None
+
+
+def test_set_overwrites_pending_and_stored(tmp_path: Path) -> None:
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    cache.set("u", '"old"', None, b"[1]", "t1")
+    cache.flush()
+    cache.set("u", '"new"', None, b"[2]", "t2")
+    entry = cache.get("u")
+    assert entry is not None and entry["etag"] == '"new"'
+    cache.flush()
+    entry = HttpCache(path=cache.path).get("u")
+    assert entry is not None and entry["body"] == b"[2]"
+
+
+def test_exit_hook_flushes_live_caches(tmp_path: Path) -> None:
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    cache.set("u", None, None, b"[]", "t")
+    assert cache in sqlite_storage._OPEN_CACHES
+    sqlite_storage._flush_open_caches()
+    assert HttpCache(path=cache.path).get("u") is not None
+
+
+def test_get_many_merges_pending_and_stored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sqlite_storage, "CACHE_READ_CHUNK", 2)
+    cache = HttpCache(path=tmp_path / "cache.sqlite")
+    for i in range(5):
+        cache.set(f"u{i}", f'"e{i}"', None, b"[]", "t")
+    cache.flush()
+    cache.set("u5", '"e5"', None, b"[]", "t")  # still buffered
+    urls = iter(["u0", "u5", "u3", "u0", "missing", "u4", "u1"])  # one-shot iterable
+    found = cache.get_many(urls)
+    assert set(found) == {"u0", "u1", "u3", "u4", "u5"}
+    assert found == {u: cache.get(u) for u in found}